@@ -16,22 +16,19 @@ except ImportError:
 try:
     from mcp_handler import (
         get_user,
-        get_lounges_with_access_rules, 
-        get_flight_aware_lounge_recommendations,
-        analyze_layover_lounge_strategy
+        get_lounges_with_access_rules,
+        get_flight_schedule
     )
 except ImportError:
     import mcp_handler
     get_user = mcp_handler.get_user
     get_lounges_with_access_rules = mcp_handler.get_lounges_with_access_rules
-    get_flight_aware_lounge_recommendations = mcp_handler.get_flight_aware_lounge_recommendations
-    analyze_layover_lounge_strategy = mcp_handler.analyze_layover_lounge_strategy
+    get_flight_schedule = mcp_handler.get_flight_schedule
 
 __version__ = "1.0.0"
 __all__ = [
     'LoungeAccessClient',
     'get_user', 
     'get_lounges_with_access_rules',
-    'get_flight_aware_lounge_recommendations',
-    'analyze_layover_lounge_strategy'
+    'get_flight_schedule'
 ]
\ No newline at end of file
@@ -1,10 +1,9 @@
-import json
-
-import boto3
-from botocore.exceptions import ClientError
 from user_profile_service import UserProfileService
 from lounge_service import LoungeService
-from flights_api_client import FlightsApiClient
+
+# flights_api_client pulls in requests and httpx; import it on first flight lookup so
+# user and lounge tools never pay for it
+FlightsApiClient = None
 
 
 class LoungeAccessClient:
@@ -12,7 +11,17 @@ class LoungeAccessClient:
         self.api_client = self._get_client()
         self.user_profile_service = UserProfileService()
         self.lounge_service = LoungeService()
-        self.flights_api_client = FlightsApiClient()
+        self._flights_api_client = None
+
+    @property
+    def flights_api_client(self):
+        """Amadeus client, built on first use."""
+        global FlightsApiClient
+        if self._flights_api_client is None:
+            if FlightsApiClient is None:
+                from flights_api_client import FlightsApiClient
+            self._flights_api_client = FlightsApiClient()
+        return self._flights_api_client
 
     def _get_client(self):
         api_client = None
@@ -31,6 +40,18 @@ class LoungeAccessClient:
         """
         return self.user_profile_service.get_user(user_id)
     
+    def get_users(self, user_ids: list):
+        """
+        Retrieves several users in one DynamoDB round trip.
+        
+        Args:
+            user_ids (list): The unique identifiers of the users
+            
+        Returns:
+            dict: user_id -> user information for every user that was found
+        """
+        return self.user_profile_service.get_users(user_ids)
+    
     def create_sample_users(self):
         """
         Creates sample users in the DynamoDB UserProfile table for testing.
@@ -102,11 +123,12 @@ class LoungeAccessClient:
         
         all_lounges = self.lounge_service.get_lounges_by_airport(airport_code)
         
-        # Filter lounges by access provider
+        # Filter lounges by access provider, lowercasing the search term once
+        needle = access_provider.lower()
         matching_lounges = []
         for lounge in all_lounges:
-            access_providers = lounge.get('access_providers', [])
-            if any(access_provider.lower() in provider.lower() for provider in access_providers):
+            access_providers = lounge.get('access_providers') or ()
+            if any(needle in provider.lower() for provider in access_providers):
                 matching_lounges.append(lounge)
         
         return matching_lounges
@@ -127,11 +149,12 @@ class LoungeAccessClient:
         
         all_lounges = self.lounge_service.get_lounges_by_airport(airport_code)
         
-        # Filter lounges by amenity
+        # Filter lounges by amenity, lowercasing the search term once
+        needle = amenity.lower()
         matching_lounges = []
         for lounge in all_lounges:
-            amenities = lounge.get('amenities', [])
-            if any(amenity.lower() in amenity_item.lower() for amenity_item in amenities):
+            amenities = lounge.get('amenities') or ()
+            if any(needle in amenity_item.lower() for amenity_item in amenities):
                 matching_lounges.append(lounge)
         
         return matching_lounges
@@ -156,6 +179,19 @@ class LoungeAccessClient:
             operational_suffix=operational_suffix
         )
     
+    def get_flight_schedules(self, flights: list):
+        """
+        Get schedule information for several flights concurrently
+        
+        Args:
+            flights (list): Dicts with carrier_code, flight_number, scheduled_departure_date
+                            and optionally operational_suffix (e.g. each segment of an itinerary)
+        
+        Returns:
+            list: Flight schedule information or error details, in request order
+        """
+        return self.flights_api_client.get_flight_schedules(flights)
+    
     def validate_flight_parameters(self, carrier_code: str, flight_number: str, scheduled_departure_date: str):
         """
         Validate flight schedule parameters
@@ -31,6 +31,7 @@ $sourceFiles = @(
     "../lounge_service.py",
     "../user_profile_service.py",
     "../flights_api_client.py",
+    "../seed_lounges.json",
     "../requirements.txt"
 )
 
@@ -50,6 +51,11 @@ if (Test-Path "requirements.txt") {
     if (Test-Path $packagesDir) { Remove-Item $packagesDir -Recurse -Force }
     New-Item -ItemType Directory -Path $packagesDir | Out-Null
 
+    # orjson and msgspec ship native wheels; always fetch the Lambda (python3.12, Linux x86_64) builds,
+    # never the ones for the machine running this script
+    $uvPlatformArgs = @("--python-platform", "x86_64-manylinux2014", "--python-version", "3.12", "--only-binary", ":all:")
+    $pipPlatformArgs = @("--platform", "manylinux2014_x86_64", "--only-binary=:all:", "--python-version", "3.12", "--implementation", "cp")
+
     # Prefer uv if available for deterministic, fast installs
     $useUv = $false
     try {
@@ -60,7 +66,7 @@ if (Test-Path "requirements.txt") {
     if ($useUv) {
         Write-Host "Using uv to install dependencies into $packagesDir" -ForegroundColor Cyan
         # uv pip install respects requirements.txt
-        uv pip install --quiet --target $packagesDir -r requirements.txt
+        uv pip install --quiet --target $packagesDir @uvPlatformArgs -r requirements.txt
         if ($LASTEXITCODE -eq 0) {
             Write-Host "Dependencies installed with uv" -ForegroundColor Green
         } else {
@@ -80,7 +86,7 @@ if (Test-Path "requirements.txt") {
             Write-Host "Using $pythonCmd with ensurepip" -ForegroundColor Cyan
             & $pythonCmd -m ensurepip --upgrade 2>$null | Out-Null
             & $pythonCmd -m pip install --quiet --upgrade pip 2>$null | Out-Null
-            & $pythonCmd -m pip install --quiet --target $packagesDir -r requirements.txt
+            & $pythonCmd -m pip install --quiet --target $packagesDir @pipPlatformArgs -r requirements.txt
             if ($LASTEXITCODE -eq 0) {
                 Write-Host "Dependencies installed with pip" -ForegroundColor Green
             } else {
@@ -146,9 +152,13 @@ try {
     $contentToZip = @()
     # All top-level python source files
     $contentToZip += (Get-ChildItem -Path . -Filter "*.py" | ForEach-Object { $_.FullName })
-    # Add dependency directories discovered (requests and its deps)
+    # Sample data read by create_sample_lounges
+    if (Test-Path "seed_lounges.json") { $contentToZip += (Resolve-Path "seed_lounges.json").Path }
+    # Add every dependency directory installed from requirements.txt
+    $dependencyDirs = @()
+    if ($packagesDir -and (Test-Path $packagesDir)) { $dependencyDirs = Get-ChildItem -Path $packagesDir -Directory | Select-Object -ExpandProperty Name }
     foreach ($dir in (Get-ChildItem -Directory)) {
-        if ($dir.Name -in @("requests","urllib3","certifi","charset_normalizer","idna")) {
+        if ($dir.Name -in $dependencyDirs -and $dir.Name -ne "__pycache__" -and $dir.Name -notlike "*.dist-info") {
             $contentToZip += $dir.FullName
         }
         if ($dir.Name -like "*.dist-info") { $contentToZip += $dir.FullName }
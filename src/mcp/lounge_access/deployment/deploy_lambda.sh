@@ -54,6 +54,7 @@ SOURCE_FILES=(
   "../lounge_service.py"
   "../user_profile_service.py"
   "../flights_api_client.py"
+  "../seed_lounges.json"
   "../requirements.txt"
 )
 
@@ -68,13 +69,17 @@ done
 
 # Install dependencies if requirements present
 PACKAGES_DIR="packages"
+# orjson and msgspec ship native wheels; always fetch the Lambda (python3.12, Linux x86_64) builds,
+# never the ones for the machine running this script
+UV_PLATFORM_ARGS=(--python-platform x86_64-manylinux2014 --python-version 3.12 --only-binary :all:)
+PIP_PLATFORM_ARGS=(--platform manylinux2014_x86_64 --only-binary=:all: --python-version 3.12 --implementation cp)
 if [[ -f requirements.txt ]]; then
   rm -rf "$PACKAGES_DIR"
   mkdir "$PACKAGES_DIR"
   echo "Installing Python dependencies..." >&2
   # Prefer uv if available
   if command -v uv >/dev/null 2>&1; then
-    if uv pip install --quiet --target "$PACKAGES_DIR" -r requirements.txt; then
+    if uv pip install --quiet --target "$PACKAGES_DIR" "${UV_PLATFORM_ARGS[@]}" -r requirements.txt; then
       echo "Dependencies installed with uv" >&2
     else
       echo "uv install failed, falling back to pip" >&2
@@ -90,7 +95,7 @@ if [[ -f requirements.txt ]]; then
     else
       "$PYTHON_BIN" -m ensurepip --upgrade >/dev/null 2>&1 || true
       "$PYTHON_BIN" -m pip install --quiet --upgrade pip >/dev/null 2>&1 || true
-      if "$PYTHON_BIN" -m pip install --quiet --target "$PACKAGES_DIR" -r requirements.txt; then
+      if "$PYTHON_BIN" -m pip install --quiet --target "$PACKAGES_DIR" "${PIP_PLATFORM_ARGS[@]}" -r requirements.txt; then
         echo "Dependencies installed with pip" >&2
       else
         echo "pip install failed; 'requests' may not be packaged" >&2
@@ -122,10 +127,16 @@ CONTENT=()
 for py in ./*.py; do
   [[ -f "$py" ]] && CONTENT+=("$py")
 done
+[[ -f ./seed_lounges.json ]] && CONTENT+=("./seed_lounges.json")
 
-for dir in requests urllib3 certifi charset_normalizer idna; do
-  [[ -d "$dir" ]] && CONTENT+=("$dir")
-done
+# Include every top-level dependency installed from requirements.txt
+if [[ -d "$PACKAGES_DIR" ]]; then
+  for d in "$PACKAGES_DIR"/*; do
+    base="$(basename "$d")"
+    [[ "$base" == "__pycache__" || "$base" == *.dist-info ]] && continue
+    [[ -e "$base" ]] && CONTENT+=("./$base")
+  done
+fi
 
 # Include *.dist-info metadata directories
 for meta in ./*.dist-info; do
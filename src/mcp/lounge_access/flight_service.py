@@ -3,28 +3,33 @@ Flight Service for LoungeAccessAdvisor
 Integrates Amadeus API for real-time flight information
 Uses the same implementation as AutoRescue project
 """
+import logging
 import os
-import json
 import boto3
+import orjson
 import requests
-from datetime import datetime, timedelta
+from cachetools import TTLCache
 from typing import Dict, Any, Optional
 
 
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+_DEBUG = LOG_LEVEL == "DEBUG"
+
+logger = logging.getLogger("flight_service")
+logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+
 # Amadeus API Configuration - Same as AutoRescue
 AMADEUS_BASE_URL = "https://test.api.amadeus.com"
 
-# Secrets cache (Lambda container reuse) - Same pattern as AutoRescue
-_secrets_cache = {
-    'amadeus_credentials': None,
-    'fetched_at': None
-}
+# Keep-alive session shared by every FlightService, so token, status and search calls reuse connections
+_HTTP = requests.Session()
+
+# Secrets cache (Lambda container reuse) - credentials are refreshed hourly
+_secrets_cache = TTLCache(maxsize=1, ttl=3600)
 
-# Token cache (Lambda container reuse) - Same pattern as AutoRescue
-_token_cache = {
-    'access_token': None,
-    'expiry': None
-}
+# Token cache (Lambda container reuse) - Amadeus tokens expire in 1799 seconds,
+# cache for 25 minutes to be safe
+_token_cache = TTLCache(maxsize=1, ttl=1500)
 
 
 def _get_amadeus_credentials() -> Dict[str, str]:
@@ -33,10 +38,9 @@ def _get_amadeus_credentials() -> Dict[str, str]:
     Uses the same secret name as AutoRescue project
     """
     # Return cached credentials if recently fetched (within 1 hour)
-    if _secrets_cache['amadeus_credentials'] and _secrets_cache['fetched_at']:
-        elapsed = datetime.now() - _secrets_cache['fetched_at']
-        if elapsed.total_seconds() < 3600:
-            return _secrets_cache['amadeus_credentials']
+    credentials = _secrets_cache.get('amadeus_credentials')
+    if credentials:
+        return credentials
     
     # Fetch from Secrets Manager - Same secret name as AutoRescue
     secret_name = "autorescue/amadeus/credentials"
@@ -46,11 +50,10 @@ def _get_amadeus_credentials() -> Dict[str, str]:
     
     try:
         response = client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(response['SecretString'])
+        secret = orjson.loads(response['SecretString'])
         
         # Cache the credentials
         _secrets_cache['amadeus_credentials'] = secret
-        _secrets_cache['fetched_at'] = datetime.now()
         
         return secret
     except Exception as e:
@@ -62,11 +65,10 @@ def _get_amadeus_token() -> str:
     Get Amadeus OAuth2 token with caching
     Identical implementation to AutoRescue
     """
-    now = datetime.now()
-    
     # Return cached token if still valid
-    if _token_cache['access_token'] and _token_cache['expiry'] and now < _token_cache['expiry']:
-        return _token_cache['access_token']
+    access_token = _token_cache.get('access_token')
+    if access_token:
+        return access_token
     
     # Get credentials from Secrets Manager
     credentials = _get_amadeus_credentials()
@@ -80,15 +82,14 @@ def _get_amadeus_token() -> str:
         "client_secret": credentials['client_secret']
     }
     
-    response = requests.post(url, headers=headers, data=data)
+    response = _HTTP.post(url, headers=headers, data=data)
     response.raise_for_status()
     
     token_data = response.json()
-    _token_cache['access_token'] = token_data['access_token']
-    # Amadeus tokens expire in 1799 seconds, cache for 25 minutes to be safe
-    _token_cache['expiry'] = now + timedelta(seconds=1500)
+    access_token = token_data['access_token']
+    _token_cache['access_token'] = access_token
     
-    return _token_cache['access_token']
+    return access_token
 
 
 class FlightService:
@@ -162,14 +163,15 @@ class FlightService:
             if operational_suffix:
                 params["operationalSuffix"] = operational_suffix
             
-            print(f"[FLIGHT_SERVICE] Calling Amadeus API: {url}")
-            print(f"[FLIGHT_SERVICE] Parameters: {params}")
+            logger.debug("Calling Amadeus API: %s params=%s", url, params)
             
-            response = requests.get(url, headers=headers, params=params)
+            response = _HTTP.get(url, headers=headers, params=params)
             response.raise_for_status()
             
-            data = response.json()
-            print(f"[FLIGHT_SERVICE] API Response: {json.dumps(data, indent=2)}")
+            data = orjson.loads(response.content)
+            if _DEBUG:
+                # Only pay for pretty-printing the full response when debugging
+                logger.debug("API Response: %s", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
             
             if not data.get('data') or len(data['data']) == 0:
                 return {
@@ -278,9 +280,9 @@ class FlightService:
             if return_date:
                 params["returnDate"] = return_date
             
-            print(f"[FLIGHT_SERVICE] Searching flights: {origin} -> {destination} on {departure_date}")
+            logger.info("Searching flights: %s -> %s on %s", origin, destination, departure_date)
             
-            response = requests.get(url, headers=headers, params=params)
+            response = _HTTP.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
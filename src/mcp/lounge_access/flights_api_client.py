@@ -3,88 +3,201 @@ Flights API Client for Amadeus Flight Schedule API
 Handles authentication and API calls for flight schedule information
 """
 import os
-import json
+import asyncio
+import concurrent.futures
 import boto3
+import httpx
+from cachetools import TTLCache
+import orjson
 import requests
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from datetime import date
+from urllib.parse import urlencode
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+import re
+import threading
+import time
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO))
-logger = logging.getLogger("flights_api_client")
+_DEBUG = LOG_LEVEL == "DEBUG"
+
+
+def configure_logger() -> logging.Logger:
+    """
+    Configure logging once at import time.
+    The level is also set on this module's logger because basicConfig is a
+    no-op when the Lambda runtime has already installed a root handler.
+    """
+    level = getattr(logging, LOG_LEVEL, logging.INFO)
+    logging.basicConfig(level=level)
+    module_logger = logging.getLogger("flights_api_client")
+    module_logger.setLevel(level)
+    return module_logger
+
+
+logger = configure_logger()
+
+# Cache lifetimes (Lambda container reuse). Amadeus tokens expire after 1799s,
+# so the token is dropped well before that.
+CREDENTIALS_TTL_SECONDS = 3600
+TOKEN_TTL_SECONDS = 1400
+# Schedules change at most a few times a day; successful lookups are reused for 5 minutes
+SCHEDULE_CACHE_TTL_SECONDS = 300
+SCHEDULE_CACHE_MAXSIZE = 512
+
+# Upper bound on a get_flight_schedules batch (token fetch plus two schedule attempts per flight)
+SCHEDULES_TIMEOUT_SECONDS = 20
+
+# Keep-alive pool shared by every FlightsApiClient so token and schedule calls reuse one TLS connection
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 20
+
+
+def _build_http_session() -> requests.Session:
+    """Create the pooled requests session used for synchronous Amadeus calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_HTTP = _build_http_session()
+
+AMADEUS_BASE_URL = "https://test.api.amadeus.com"
+PREWARM_TIMEOUT_SECONDS = 2
+
+
+def _prewarm_http_pool() -> None:
+    """Open a pooled connection to Amadeus so the first real call skips the TCP/TLS handshake"""
+    try:
+        _HTTP.head(AMADEUS_BASE_URL, timeout=PREWARM_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        logger.debug("Amadeus connection prewarm failed: %s", e)
+
+
+# Opt-in so tests and offline tooling never touch the network on import; the handshake then
+# overlaps the Secrets Manager and token fetches of the first flight lookup
+if os.getenv("AMADEUS_PREWARM") == "1":
+    threading.Thread(target=_prewarm_http_pool, daemon=True).start()
+
+# Secrets Manager client shared across invocations; built lazily on first cache miss
+_SM_CLIENT = None
+_SM_LOCK = threading.Lock()
+
+
+def _sm_client():
+    """Return the shared Secrets Manager client, creating it on first use"""
+    global _SM_CLIENT
+    if _SM_CLIENT is None:
+        with _SM_LOCK:
+            if _SM_CLIENT is None:
+                _SM_CLIENT = boto3.client('secretsmanager', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+    return _SM_CLIENT
+
+
+# Event loop that owns every pooled httpx.AsyncClient. It runs on a daemon thread for the life of
+# the container, so get_flight_schedules reuses open connections across calls and works even
+# when its caller is already inside a running event loop
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_ASYNC_LOOP_LOCK = threading.Lock()
+
+
+def _async_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use"""
+    global _ASYNC_LOOP
+    if _ASYNC_LOOP is None:
+        with _ASYNC_LOOP_LOCK:
+            if _ASYNC_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="amadeus-async", daemon=True).start()
+                _ASYNC_LOOP = loop
+    return _ASYNC_LOOP
+
+
+# Precompiled validators for validate_flight_parameters (cheaper than strptime per call)
+_CARRIER_RE = re.compile(r"[A-Z]{2}")
+_FLTNUM_RE = re.compile(r"[0-9]{1,4}")
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
 
 
 class FlightsApiClient:
     """Client for Amadeus Flight Schedule API"""
     
     def __init__(self):
-        self.base_url = "https://test.api.amadeus.com"
-        self._secrets_cache = {'amadeus_credentials': None, 'fetched_at': None}
-        self._token_cache = {'access_token': None, 'expiry': None}
+        self.base_url = AMADEUS_BASE_URL
+        self._secrets_cache = TTLCache(maxsize=1, ttl=CREDENTIALS_TTL_SECONDS)
+        self._token_cache = TTLCache(maxsize=1, ttl=TOKEN_TTL_SECONDS)
+        self._schedule_cache = TTLCache(maxsize=SCHEDULE_CACHE_MAXSIZE, ttl=SCHEDULE_CACHE_TTL_SECONDS)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        # Concurrent async lookups fetch the token on worker threads; only one of them refreshes it
+        self._token_lock = threading.Lock()
+        # url-encoded OAuth body, rebuilt whenever credentials are fetched
+        self._token_form: Optional[bytes] = None
     
     def _get_amadeus_credentials(self) -> Dict[str, str]:
         """
         Fetch Amadeus credentials from AWS Secrets Manager with caching
         """
         # Return cached credentials if recently fetched (within 1 hour)
-        if self._secrets_cache['amadeus_credentials'] and self._secrets_cache['fetched_at']:
-            elapsed = datetime.now() - self._secrets_cache['fetched_at']
-            if elapsed.total_seconds() < 3600:
-                logger.debug("Using cached Amadeus credentials (age=%ss)", int(elapsed.total_seconds()))
-                return self._secrets_cache['amadeus_credentials']
+        credentials = self._secrets_cache.get('amadeus_credentials')
+        if credentials:
+            logger.debug("Using cached Amadeus credentials")
+            return credentials
         
         # Fetch from Secrets Manager
         secret_name = "autorescue/amadeus/credentials"
-        region_name = os.getenv('AWS_REGION', 'us-east-1')
-        
-        client = boto3.client('secretsmanager', region_name=region_name)
+        client = _sm_client()
         
         try:
-            start = datetime.now()
+            start = time.monotonic_ns()
             response = client.get_secret_value(SecretId=secret_name)
-            duration_ms = int((datetime.now() - start).total_seconds() * 1000)
-            secret = json.loads(response['SecretString'])
+            duration_ms = (time.monotonic_ns() - start) // 1_000_000
+            secret = orjson.loads(response['SecretString'])
             logger.debug("Fetched Amadeus credentials from Secrets Manager in %dms", duration_ms)
+            self._token_form = urlencode({
+                "grant_type": "client_credentials",
+                "client_id": secret['client_id'],
+                "client_secret": secret['client_secret']
+            }).encode()
             self._secrets_cache['amadeus_credentials'] = secret
-            self._secrets_cache['fetched_at'] = datetime.now()
             return secret
         except Exception as e:
-            logger.error("Error fetching Amadeus credentials: %s", e, exc_info=LOG_LEVEL=="DEBUG")
+            logger.error("Error fetching Amadeus credentials: %s", e, exc_info=_DEBUG)
             raise RuntimeError(f"Failed to fetch Amadeus credentials from Secrets Manager: {str(e)}")
     
     def _get_amadeus_token(self) -> str:
         """
         Get Amadeus OAuth2 token with caching
         """
-        now = datetime.now()
-        
-        # Return cached token if still valid
-        if self._token_cache['access_token'] and self._token_cache['expiry'] and now < self._token_cache['expiry']:
-            remaining = int((self._token_cache['expiry'] - now).total_seconds())
-            logger.debug("Using cached Amadeus token (remaining=%ss)", remaining)
-            return self._token_cache['access_token']
-        
-        # Get credentials from Secrets Manager
-        credentials = self._get_amadeus_credentials()
-        
-        # Request new token
-        url = f"{self.base_url}/v1/security/oauth2/token"
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": credentials['client_id'],
-            "client_secret": credentials['client_secret']
-        }
-        logger.debug("Requesting new Amadeus token: POST %s", url)
-        response = requests.post(url, headers=headers, data=data)
-        logger.debug("Token response status: %s", response.status_code)
-        response.raise_for_status()
-        token_data = response.json()
-        self._token_cache['access_token'] = token_data['access_token']
-        self._token_cache['expiry'] = now + timedelta(seconds=1500)
-        logger.debug("Obtained new Amadeus token; cached until %s", self._token_cache['expiry'])
-        return self._token_cache['access_token']
+        with self._token_lock:
+            # Return cached token if still valid
+            access_token = self._token_cache.get('access_token')
+            if access_token:
+                logger.debug("Using cached Amadeus token")
+                return access_token
+            
+            # Make sure credentials (and the pre-encoded form built from them) are current
+            self._get_amadeus_credentials()
+            
+            # Request new token
+            url = f"{self.base_url}/v1/security/oauth2/token"
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            logger.debug("Requesting new Amadeus token: POST %s", url)
+            response = _HTTP.post(url, headers=headers, data=self._token_form)
+            logger.debug("Token response status: %s", response.status_code)
+            response.raise_for_status()
+            token_data = response.json()
+            access_token = token_data['access_token']
+            self._token_cache['access_token'] = access_token
+            logger.debug("Obtained new Amadeus token; cached for %ss", TOKEN_TTL_SECONDS)
+            return access_token
+    
+    def _invalidate_token(self) -> None:
+        """Drop the cached Amadeus token so the next call fetches a fresh one"""
+        with self._token_lock:
+            self._token_cache.pop('access_token', None)
     
     def get_flight_schedule(
         self,
@@ -107,86 +220,275 @@ class FlightsApiClient:
         """
         try:
             logger.debug("Starting get_flight_schedule carrier=%s flight=%s date=%s suffix=%s", carrier_code, flight_number, scheduled_departure_date, operational_suffix)
-            token = self._get_amadeus_token()
-            
-            # Prepare the API call
-            url = f"{self.base_url}/v2/schedule/flights"
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
-            
-            # Build query parameters
-            params = {
-                "carrierCode": carrier_code.upper(),
-                "flightNumber": flight_number,
-                "scheduledDepartureDate": scheduled_departure_date
+            key = self._schedule_key(carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+            cached = self._schedule_cache.get(key)
+            if cached is not None:
+                logger.debug("Using cached flight schedule for %s", key)
+                return cached
+            for attempt in range(2):
+                token = self._get_amadeus_token()
+                url, headers, params = self._build_schedule_request(token, carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+                
+                # Make the API call
+                response = _HTTP.get(url, headers=headers, params=params)
+                logger.debug("Schedule API response status: %s", response.status_code)
+                if response.status_code == 401 and attempt == 0:
+                    # Cached token was rejected; refresh it and retry once instead of failing the invocation
+                    logger.info("Schedule API returned 401; refreshing Amadeus token and retrying")
+                    self._invalidate_token()
+                    continue
+                response.raise_for_status()
+                result = self._map_schedule_response(orjson.loads(response.content), carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+                return self._cache_schedule(key, result)
+                
+        except requests.exceptions.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else "unknown"
+            return self._schedule_http_error(status_code, str(e), carrier_code, flight_number, scheduled_departure_date)
+        except Exception as e:
+            logger.error("Unexpected error in get_flight_schedule: %s", e, exc_info=_DEBUG)
+            return self._schedule_unexpected_error(e, carrier_code, flight_number, scheduled_departure_date)
+    
+    async def get_flight_schedule_async(
+        self,
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str,
+        operational_suffix: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of get_flight_schedule that shares one pooled HTTP/2 client,
+        so several lookups can be awaited concurrently with asyncio.gather.
+        The pooled client lives on the shared background loop; calls made from any
+        other event loop are forwarded to it
+        
+        Args:
+            carrier_code (str): IATA carrier code (e.g., 'AA', 'DL', 'UA')
+            flight_number (str): Flight number (e.g., '1234')
+            scheduled_departure_date (str): Departure date in YYYY-MM-DD format (local to departure airport)
+            operational_suffix (str, optional): Operational suffix like 'A' or 'B'
+        
+        Returns:
+            dict: Flight schedule information or error details
+        """
+        loop = _async_loop()
+        lookup = self._get_flight_schedule_on_loop(carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+        if asyncio.get_running_loop() is loop:
+            return await lookup
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(lookup, loop))
+    
+    async def _get_flight_schedule_on_loop(
+        self,
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str,
+        operational_suffix: Optional[str]
+    ) -> Dict[str, Any]:
+        """get_flight_schedule_async body; must run on the shared background loop"""
+        try:
+            logger.debug("Starting get_flight_schedule_async carrier=%s flight=%s date=%s suffix=%s", carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+            key = self._schedule_key(carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+            cached = self._schedule_cache.get(key)
+            if cached is not None:
+                logger.debug("Using cached flight schedule for %s", key)
+                return cached
+            # Token is cached after the first call; only a cold fetch blocks, so keep it off the loop
+            for attempt in range(2):
+                token = await asyncio.to_thread(self._get_amadeus_token)
+                url, headers, params = self._build_schedule_request(token, carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+                
+                response = await self._get_async_client().get(url, headers=headers, params=params)
+                logger.debug("Schedule API response status: %s", response.status_code)
+                if response.status_code == 401 and attempt == 0:
+                    logger.info("Schedule API returned 401; refreshing Amadeus token and retrying")
+                    # The token lock is a blocking threading.Lock, so take it off the loop
+                    await asyncio.to_thread(self._invalidate_token)
+                    continue
+                response.raise_for_status()
+                result = self._map_schedule_response(orjson.loads(response.content), carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+                return self._cache_schedule(key, result)
+        
+        except httpx.HTTPStatusError as e:
+            # A 401 here invalidates the token under its lock
+            return await asyncio.to_thread(
+                self._schedule_http_error, e.response.status_code, str(e), carrier_code, flight_number, scheduled_departure_date
+            )
+        except Exception as e:
+            logger.error("Unexpected error in get_flight_schedule_async: %s", e, exc_info=_DEBUG)
+            return self._schedule_unexpected_error(e, carrier_code, flight_number, scheduled_departure_date)
+    
+    def get_flight_schedules(self, flights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Look up several flights concurrently (e.g. every segment of an itinerary)
+        
+        Args:
+            flights (list): Dicts with carrier_code, flight_number, scheduled_departure_date
+                            and optionally operational_suffix
+        
+        Returns:
+            list: One schedule result per requested flight, in the same order
+        """
+        async def _gather():
+            return await asyncio.gather(*(self.get_flight_schedule_async(**flight) for flight in flights))
+        
+        # Run on the long-lived loop so the pooled client and its connections survive between calls
+        future = asyncio.run_coroutine_threadsafe(_gather(), _async_loop())
+        try:
+            return future.result(timeout=SCHEDULES_TIMEOUT_SECONDS)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning("get_flight_schedules timed out after %ss for %d flights", SCHEDULES_TIMEOUT_SECONDS, len(flights))
+            error = TimeoutError(f"Schedule lookups did not finish within {SCHEDULES_TIMEOUT_SECONDS}s")
+            return [
+                self._schedule_unexpected_error(error, flight["carrier_code"], flight["flight_number"], flight["scheduled_departure_date"])
+                for flight in flights
+            ]
+    
+    def invalidate_schedule(
+        self,
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str,
+        operational_suffix: Optional[str] = None
+    ) -> None:
+        """Drop a cached schedule so the next lookup for that flight goes to Amadeus"""
+        key = self._schedule_key(carrier_code, flight_number, scheduled_departure_date, operational_suffix)
+        self._schedule_cache.pop(key, None)
+    
+    @staticmethod
+    def _schedule_key(
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str,
+        operational_suffix: Optional[str]
+    ) -> Tuple[str, str, str, Optional[str]]:
+        """Cache key for a schedule lookup"""
+        return (carrier_code.upper(), flight_number, scheduled_departure_date, operational_suffix)
+    
+    def _cache_schedule(self, key: Tuple[str, str, str, Optional[str]], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember successful schedule lookups; errors and misses are never cached"""
+        if result.get("status") == "success":
+            self._schedule_cache[key] = result
+        return result
+    
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client if one was created"""
+        loop = _async_loop()
+        if asyncio.get_running_loop() is not loop:
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.aclose(), loop))
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared async HTTP client; only called on the background loop"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(http2=True, timeout=5.0)
+        return self._async_client
+    
+    def _build_schedule_request(
+        self,
+        token: str,
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str,
+        operational_suffix: Optional[str]
+    ) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """Build url, headers and query parameters for the schedule API"""
+        url = f"{self.base_url}/v2/schedule/flights"
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        
+        # Build query parameters
+        params = {
+            "carrierCode": carrier_code.upper(),
+            "flightNumber": flight_number,
+            "scheduledDepartureDate": scheduled_departure_date
+        }
+        
+        if operational_suffix:
+            params["operationalSuffix"] = operational_suffix
+        
+        return url, headers, params
+    
+    def _map_schedule_response(
+        self,
+        flight_data: Dict[str, Any],
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str,
+        operational_suffix: Optional[str]
+    ) -> Dict[str, Any]:
+        """Map a raw schedule API payload to the tool response format"""
+        if "data" in flight_data and flight_data["data"]:
+            flight_info = flight_data["data"][0]
+            flight_points = flight_info.get("flightPoints", [])
+            segments = flight_info.get("segments", [])
+            legs = flight_info.get("legs", [])
+            departure_airport = None
+            arrival_airport = None
+            departure_timings = []
+            arrival_timings = []
+            if flight_points:
+                # Only the origin and final destination points are used
+                first, last = flight_points[0], flight_points[-1]
+                departure_airport = first.get("iataCode")
+                if len(flight_points) >= 2:
+                    arrival_airport = last.get("iataCode")
+                departure_timings = first.get("departure", {}).get("timings") or []
+                arrival_timings = last.get("arrival", {}).get("timings") or []
+            aircraft_type = None
+            if legs:
+                ae = legs[0].get("aircraftEquipment", {})
+                aircraft_type = ae.get("aircraftType")
+            operating_carrier = None
+            if segments:
+                partnership = segments[0].get("partnership", {})
+                operating_flight = partnership.get("operatingFlight", {})
+                if operating_flight:
+                    operating_carrier = {
+                        "carrierCode": operating_flight.get("carrierCode"),
+                        "flightNumber": operating_flight.get("flightNumber")
+                    }
+            result = {
+                "status": "success",
+                "meta": {
+                    "count": flight_data.get("meta", {}).get("count"),
+                    "links": flight_data.get("meta", {}).get("links", {})
+                },
+                "requested": {
+                    "carrier_code": carrier_code.upper(),
+                    "flight_number": flight_number,
+                    "scheduled_departure_date": scheduled_departure_date,
+                    "operational_suffix": operational_suffix
+                },
+                "flight_designator": flight_info.get("flightDesignator", {}),
+                "departure_airport": departure_airport,
+                "arrival_airport": arrival_airport,
+                "departure_timings": departure_timings,
+                "arrival_timings": arrival_timings,
+                "segments": [
+                    {
+                        "board_point": segment.get("boardPointIataCode"),
+                        "off_point": segment.get("offPointIataCode"),
+                        "duration": segment.get("scheduledSegmentDuration")
+                    }
+                    for segment in segments
+                ],
+                "legs": [
+                    {
+                        "board_point": leg.get("boardPointIataCode"),
+                        "off_point": leg.get("offPointIataCode"),
+                        "aircraft_type": leg.get("aircraftEquipment", {}).get("aircraftType"),
+                        "duration": leg.get("scheduledLegDuration")
+                    }
+                    for leg in legs
+                ],
+                "aircraft_type": aircraft_type,
+                "operating_carrier": operating_carrier
             }
-            
-            if operational_suffix:
-                params["operationalSuffix"] = operational_suffix
-            
-            # Make the API call
-            response = requests.get(url, headers=headers, params=params)
-            logger.debug("Schedule API response status: %s", response.status_code)
-            response.raise_for_status()
-            flight_data = response.json()
-            if "data" in flight_data and flight_data["data"]:
-                flight_info = flight_data["data"][0]
-                flight_points = flight_info.get("flightPoints", [])
-                segments = flight_info.get("segments", [])
-                legs = flight_info.get("legs", [])
-                departure_airport = None
-                arrival_airport = None
-                if flight_points:
-                    if len(flight_points) >= 1 and "iataCode" in flight_points[0]:
-                        departure_airport = flight_points[0]["iataCode"]
-                    if len(flight_points) >= 2 and "iataCode" in flight_points[-1]:
-                        arrival_airport = flight_points[-1]["iataCode"]
-                departure_timings = []
-                arrival_timings = []
-                if flight_points:
-                    for idx, fp in enumerate(flight_points):
-                        if idx == 0 and fp.get("departure", {}).get("timings"):
-                            departure_timings = fp["departure"]["timings"]
-                        if idx == len(flight_points) - 1 and fp.get("arrival", {}).get("timings"):
-                            arrival_timings = fp["arrival"]["timings"]
-                aircraft_type = None
-                if legs:
-                    ae = legs[0].get("aircraftEquipment", {})
-                    aircraft_type = ae.get("aircraftType")
-                operating_carrier = None
-                if segments:
-                    partnership = segments[0].get("partnership", {})
-                    operating_flight = partnership.get("operatingFlight", {})
-                    if operating_flight:
-                        operating_carrier = {
-                            "carrierCode": operating_flight.get("carrierCode"),
-                            "flightNumber": operating_flight.get("flightNumber")
-                        }
-                result = {
-                    "status": "success",
-                    "meta": {
-                        "count": flight_data.get("meta", {}).get("count"),
-                        "links": flight_data.get("meta", {}).get("links", {})
-                    },
-                    "requested": {
-                        "carrier_code": carrier_code.upper(),
-                        "flight_number": flight_number,
-                        "scheduled_departure_date": scheduled_departure_date,
-                        "operational_suffix": operational_suffix
-                    },
-                    "flight_designator": flight_info.get("flightDesignator", {}),
-                    "departure_airport": departure_airport,
-                    "arrival_airport": arrival_airport,
-                    "departure_timings": departure_timings,
-                    "arrival_timings": arrival_timings,
-                    "segments": segments,
-                    "legs": legs,
-                    "aircraft_type": aircraft_type,
-                    "operating_carrier": operating_carrier,
-                    "raw": flight_info
-                }
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
                     "Flight schedule mapped: carrier=%s flight=%s dep=%s arr=%s STD=%s STA=%s",
                     carrier_code.upper(),
@@ -196,60 +498,73 @@ class FlightsApiClient:
                     departure_timings[0]["value"] if departure_timings else None,
                     arrival_timings[0]["value"] if arrival_timings else None
                 )
-                return result
-            else:
-                return {
-                    "carrier_code": carrier_code.upper(),
-                    "flight_number": flight_number,
-                    "scheduled_departure_date": scheduled_departure_date,
-                    "status": "no_flights_found",
-                    "message": "No flight data found for the specified criteria"
-                }
-                
-        except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response is not None else "unknown"
-            logger.warning("HTTP error from schedule API status=%s carrier=%s flight=%s date=%s", status_code, carrier_code, flight_number, scheduled_departure_date)
-            if e.response.status_code == 400:
-                return {
-                    "carrier_code": carrier_code.upper(),
-                    "flight_number": flight_number,
-                    "scheduled_departure_date": scheduled_departure_date,
-                    "status": "error",
-                    "error": "Invalid request parameters",
-                    "details": str(e)
-                }
-            elif e.response.status_code == 401:
-                # Invalidate token cache for next call
-                self._token_cache['access_token'] = None
-                self._token_cache['expiry'] = None
-                return {
-                    "carrier_code": carrier_code.upper(),
-                    "flight_number": flight_number,
-                    "scheduled_departure_date": scheduled_departure_date,
-                    "status": "error",
-                    "error": "Authentication failed",
-                    "details": "Invalid or expired Amadeus API credentials"
-                }
-            else:
-                return {
-                    "carrier_code": carrier_code.upper(),
-                    "flight_number": flight_number,
-                    "scheduled_departure_date": scheduled_departure_date,
-                    "status": "error",
-                    "error": f"HTTP {e.response.status_code}",
-                    "details": str(e)
-                }
-        except Exception as e:
-            logger.error("Unexpected error in get_flight_schedule: %s", e, exc_info=LOG_LEVEL=="DEBUG")
+            return result
+        else:
+            return {
+                "carrier_code": carrier_code.upper(),
+                "flight_number": flight_number,
+                "scheduled_departure_date": scheduled_departure_date,
+                "status": "no_flights_found",
+                "message": "No flight data found for the specified criteria"
+            }
+    
+    def _schedule_http_error(
+        self,
+        status_code,
+        details: str,
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str
+    ) -> Dict[str, Any]:
+        """Map an HTTP error status from the schedule API to an error response"""
+        logger.warning("HTTP error from schedule API status=%s carrier=%s flight=%s date=%s", status_code, carrier_code, flight_number, scheduled_departure_date)
+        if status_code == 400:
             return {
                 "carrier_code": carrier_code.upper(),
                 "flight_number": flight_number,
                 "scheduled_departure_date": scheduled_departure_date,
                 "status": "error",
-                "error": "Unexpected error",
-                "details": str(e)
+                "error": "Invalid request parameters",
+                "details": details
+            }
+        elif status_code == 401:
+            # Invalidate token cache for next call
+            self._invalidate_token()
+            return {
+                "carrier_code": carrier_code.upper(),
+                "flight_number": flight_number,
+                "scheduled_departure_date": scheduled_departure_date,
+                "status": "error",
+                "error": "Authentication failed",
+                "details": "Invalid or expired Amadeus API credentials"
+            }
+        else:
+            return {
+                "carrier_code": carrier_code.upper(),
+                "flight_number": flight_number,
+                "scheduled_departure_date": scheduled_departure_date,
+                "status": "error",
+                "error": f"HTTP {status_code}",
+                "details": details
             }
     
+    def _schedule_unexpected_error(
+        self,
+        error: Exception,
+        carrier_code: str,
+        flight_number: str,
+        scheduled_departure_date: str
+    ) -> Dict[str, Any]:
+        """Build the error response for unexpected failures"""
+        return {
+            "carrier_code": carrier_code.upper(),
+            "flight_number": flight_number,
+            "scheduled_departure_date": scheduled_departure_date,
+            "status": "error",
+            "error": "Unexpected error",
+            "details": str(error)
+        }
+    
     def validate_flight_parameters(
         self,
         carrier_code: str,
@@ -272,24 +587,31 @@ class FlightsApiClient:
         # Validate carrier code
         if not carrier_code or not isinstance(carrier_code, str):
             errors.append("Carrier code is required and must be a string")
-        elif len(carrier_code) != 2:
-            errors.append("Carrier code must be exactly 2 characters (IATA code)")
-        elif not carrier_code.isalpha():
-            errors.append("Carrier code must contain only alphabetic characters")
+        elif not _CARRIER_RE.fullmatch(carrier_code.upper()):
+            if len(carrier_code) != 2:
+                errors.append("Carrier code must be exactly 2 characters (IATA code)")
+            else:
+                errors.append("Carrier code must contain only alphabetic characters")
         
         # Validate flight number
         if not flight_number or not isinstance(flight_number, str):
             errors.append("Flight number is required and must be a string")
-        elif not flight_number.isdigit():
-            errors.append("Flight number must contain only numeric characters")
+        elif not _FLTNUM_RE.fullmatch(flight_number):
+            # isdigit alone accepts non-ASCII digits such as "١٢٣", which the API rejects
+            if not (flight_number.isascii() and flight_number.isdigit()):
+                errors.append("Flight number must contain only numeric characters")
+            else:
+                errors.append("Flight number must be at most 4 digits")
         
         # Validate departure date
         if not scheduled_departure_date or not isinstance(scheduled_departure_date, str):
             errors.append("Scheduled departure date is required and must be a string")
+        elif not _DATE_RE.fullmatch(scheduled_departure_date):
+            errors.append("Scheduled departure date must be in YYYY-MM-DD format")
         else:
             try:
-                # Try to parse the date
-                datetime.strptime(scheduled_departure_date, "%Y-%m-%d")
+                # Shape is right; make sure it is a real calendar date
+                date.fromisoformat(scheduled_departure_date)
             except ValueError:
                 errors.append("Scheduled departure date must be in YYYY-MM-DD format")
         
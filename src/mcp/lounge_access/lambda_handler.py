@@ -1,16 +1,141 @@
-import json
+import logging
 import os
-from datetime import datetime
+import re
+import sys
+from decimal import Decimal
+from typing import Annotated, Optional
+
+import msgspec
+import orjson
 
 from mcp_handler import get_user, get_lounges_with_access_rules, get_flight_schedule
-from api_client import LoungeAccessClient
 
+logger = logging.getLogger("lambda_handler")
+logger.setLevel(getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO))
+
+
+def _decimal_to_number(value):
+    """DynamoDB returns every number as Decimal; send integral values as ints and the rest as floats."""
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+# Types orjson can't encode natively (DynamoDB numbers and sets), keyed by exact type to skip isinstance checks
+_DEFAULTS = {Decimal: _decimal_to_number, set: list, frozenset: list}
+
+
+def _default(obj):
+    handler = _DEFAULTS.get(type(obj))
+    return handler(obj) if handler is not None else str(obj)
+
+
+def _dumps(obj):
+    """Serialize a response body; orjson handles datetimes natively, other types go through _DEFAULTS."""
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_UTC_Z).decode()
+
+
+class FlightScheduleRequest(msgspec.Struct):
+    """get_flight_schedule payload; msgspec checks presence and format in one pass."""
+    carrier_code: Annotated[str, msgspec.Meta(pattern="^[A-Za-z]{2}$")]
+    flight_number: Annotated[str, msgspec.Meta(pattern="^[0-9]{1,4}$")]
+    scheduled_departure_date: Annotated[str, msgspec.Meta(pattern="^[0-9]{4}-[0-9]{2}-[0-9]{2}$")]
+    operational_suffix: Optional[str] = None
+
+
+_FLIGHT_SCHEDULE_REQUIRED = ("carrier_code", "flight_number", "scheduled_departure_date")
+_INVALID_FLIGHT_PARAMETERS = (
+    "Invalid parameters: carrier_code must be 2 letters, flight_number 1-4 digits, "
+    "scheduled_departure_date YYYY-MM-DD and operational_suffix a string"
+)
+
+
+# IATA airport codes are three letters; anything else cannot match a Lounges partition
+_AIRPORT_CODE = re.compile(r"[A-Za-z]{3}")
+
+
+def _search_lounges(payload, get_client):
+    airport = payload.get("airport", None)
+    if not airport:
+        return 400, {"error": "Missing required parameter: airport"}
+    if not isinstance(airport, str) or not _AIRPORT_CODE.fullmatch(airport):
+        return 400, {"error": "Invalid airport code: expected a 3-letter IATA code"}
+    user_id = payload.get("user_id")
+    if user_id is not None and not isinstance(user_id, str):
+        return 400, {"error": "Invalid user_id: expected a string"}
+    try:
+        result = get_lounges_with_access_rules(airport, get_client(), user_id)
+        return 200, {"result": result}
+    except Exception as e:
+        logger.exception("search_lounges failed")
+        return 500, {"error": str(e)}
+
+
+def _get_user(payload, get_client):
+    user_id = payload.get("user_id", None)
+    if not user_id:
+        return 400, {"error": "Missing required parameter: user_id"}
+    if not isinstance(user_id, str):
+        return 400, {"error": "Invalid user_id: expected a string"}
+    try:
+        result = get_user(user_id, get_client())
+        return 200, {"result": result}
+    except ValueError as e:
+        return 400, {"error": str(e)}
+
+
+def _get_flight_schedule(payload, get_client):
+    # Absent, null and empty fields all count as missing, as before the msgspec Struct
+    if not all(payload.get(field) for field in _FLIGHT_SCHEDULE_REQUIRED):
+        return 400, {
+            "error": "Missing required parameters: carrier_code, flight_number, scheduled_departure_date"
+        }
+    try:
+        req = msgspec.convert(payload, FlightScheduleRequest)
+    except msgspec.ValidationError:
+        # msgspec's error wording is not part of this API; report a fixed message instead
+        return 400, {"error": _INVALID_FLIGHT_PARAMETERS}
+
+    try:
+        result = get_flight_schedule(
+            carrier_code=req.carrier_code,
+            flight_number=req.flight_number,
+            scheduled_departure_date=req.scheduled_departure_date,
+            api_client=get_client(),
+            operational_suffix=req.operational_suffix
+        )
+        return 200, {"result": result}
+    except Exception as e:
+        logger.exception("get_flight_schedule failed")
+        return 500, {"error": str(e)}
+
+
+# Shared across warm invocations; built on first use so importing this module stays side-effect free
+_CLIENT = None
+
+# api_client pulls in boto3, requests and httpx; import it on first use so invocations rejected
+# before reaching a tool (unknown tool, missing parameters) never pay for it
+LoungeAccessClient = None
+
+
+def _get_lounge_access_client():
+    global _CLIENT, LoungeAccessClient
+    if _CLIENT is None:
+        if LoungeAccessClient is None:
+            from api_client import LoungeAccessClient
+        _CLIENT = LoungeAccessClient()
+    return _CLIENT
+
+
+# Tool name -> handler; each handler validates its payload before asking for the client
+# and returns (status_code, body_dict)
+_HANDLERS = {
+    "search_lounges": _search_lounges,
+    "get_user": _get_user,
+    "get_flight_schedule": _get_flight_schedule,
+}
+
+# The unknown-tool response never changes, so encode it once at import
+_UNKNOWN_TOOL_RESPONSE_BODY = _dumps({"error": "Unknown tool", "available_tools": list(_HANDLERS)})
 
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
 
 def lambda_handler(event, context):
     """
@@ -25,71 +150,36 @@ def lambda_handler(event, context):
     tool_name = None
     if context.client_context and context.client_context.custom:
         tool_name = context.client_context.custom.get("bedrockAgentCoreToolName")
-    tool = tool_name.split("___")[-1] if tool_name and "___" in tool_name else tool_name
-
-    payload = event
-
-    lounge_access_client = LoungeAccessClient()
-
-    print(f"tool: {tool}, payload: {payload}")
-
-    match tool:
-        case "search_lounges":
-            airport = payload.get("airport", None)
-            if not airport:
-                return {"statusCode": 400,
-                        "body": json.dumps({"error": "Missing required parameter: airport"})}
-            try:
-                result = get_lounges_with_access_rules(airport,lounge_access_client)
-                return {
-                    "statusCode": 200,
-                    "body": json.dumps({"result": result}, cls=DateTimeEncoder)
-                }
-            except Exception as e:
-                return {"statusCode": 500,
-                        "body": json.dumps({"error": str(e)})}
-        case "get_user":
-            user_id = payload.get("user_id", None)
-            if not user_id:
-                return {"statusCode": 400, "body": json.dumps({"error": "Missing required parameter: user_id"})}
-            try:
-                result = get_user(user_id, lounge_access_client)
-                return {"statusCode": 200, "body": json.dumps({"result": result}, cls=DateTimeEncoder)}
-            except ValueError as e:
-                return {"statusCode": 400, "body": json.dumps({"error": str(e)})}
-
-        case "get_flight_schedule":
-            # Required parameters
-            carrier_code = payload.get("carrier_code", None)
-            flight_number = payload.get("flight_number", None) 
-            scheduled_departure_date = payload.get("scheduled_departure_date", None)
-            
-            if not carrier_code or not flight_number or not scheduled_departure_date:
-                return {
-                    "statusCode": 400,
-                    "body": json.dumps({
-                        "error": "Missing required parameters: carrier_code, flight_number, scheduled_departure_date"
-                    })
-                }
-            
-            # Optional parameter
-            operational_suffix = payload.get("operational_suffix", None)
-            
-            try:
-                result = get_flight_schedule(
-                    carrier_code=carrier_code,
-                    flight_number=flight_number,
-                    scheduled_departure_date=scheduled_departure_date,
-                    api_client=lounge_access_client,
-                    operational_suffix=operational_suffix
-                )
-                return {
-                    "statusCode": 200,
-                    "body": json.dumps({"result": result}, cls=DateTimeEncoder)
-                }
-            except Exception as e:
-                return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
-
-        case _:
-            return {"statusCode": 400, "body": json.dumps({"error": "Unknown tool"})}
+    tool = None
+    if tool_name:
+        # Strip the gateway target prefix ("<target>___<tool>") without building a list; interning lets
+        # the _HANDLERS lookup match the identifier-like keys by identity
+        idx = tool_name.rfind("___")
+        tool = sys.intern(tool_name[idx + 3:] if idx >= 0 else tool_name)
+
+    # Bedrock invokes with the payload as the event; API Gateway wraps it in a JSON string body
+    body = event.get("body")
+    if body is None:
+        payload = event
+    elif type(body) is str:
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return {"statusCode": 400, "body": _dumps({"error": "Invalid JSON body"})}
+        # Valid JSON that isn't an object ("[]", "5") has no tool parameters to read
+        if not isinstance(payload, dict):
+            return {"statusCode": 400, "body": _dumps({"error": "Invalid JSON body"})}
+    elif type(body) is dict:
+        payload = body
+    else:
+        return {"statusCode": 400, "body": _dumps({"error": "Invalid request body"})}
+
+    logger.info("dispatch tool=%s keys=%s", tool, list(payload)[:10])
+    logger.debug("payload=%s", payload)
+
+    handler = _HANDLERS.get(tool)
+    if handler is None:
+        return {"statusCode": 400, "body": _UNKNOWN_TOOL_RESPONSE_BODY}
 
+    status_code, body = handler(payload, _get_lounge_access_client)
+    return {"statusCode": status_code, "body": _dumps(body)}
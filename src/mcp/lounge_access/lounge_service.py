@@ -1,98 +1,334 @@
+import copy
+import json
+import logging
+import os
+import time
+from decimal import Decimal
+
 import boto3
 from botocore.exceptions import ClientError
 from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from cachetools import LRUCache, TTLCache
+
+# Lounge/provider data is close to static, so warm containers can serve repeat airports from memory
+LOUNGES_CACHE_TTL_SECONDS = 300
+LOUNGES_CACHE_MAXSIZE = 256
+
+# Lounge rows at this version carry precomputed access_details and need no provider merge on read
+LOUNGE_SCHEMA_VERSION = 2
+
+# Sample data loaded by create_sample_lounges
+SEED_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_lounges.json")
+
+# BatchWriteItem accepts at most 25 put requests per call
+BATCH_WRITE_LIMIT = 25
+
+# BatchGetItem accepts at most 100 keys per call; throttled keys come back as UnprocessedKeys.
+# The attempt cap and backoff also apply to UnprocessedItems from BatchWriteItem
+BATCH_GET_LIMIT = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+BATCH_GET_BACKOFF_SECONDS = 0.05
+
+_SERIALIZER = TypeSerializer()
+_DESERIALIZER = TypeDeserializer()
+
+logger = logging.getLogger("lounge_service")
+
+
+def _projection(attributes):
+    """Build a ProjectionExpression with every attribute aliased, sidestepping DynamoDB reserved words."""
+    names = {f"#p{i}": attr for i, attr in enumerate(attributes)}
+    return ",".join(names), names
+
+
+# Attributes get_lounges_with_access_rules returns; everything else stays in DynamoDB
+LOUNGE_PROJECTION, LOUNGE_PROJECTION_NAMES = _projection((
+    "airport", "lounge_id", "name", "terminal", "access_providers", "amenities", "hours",
+    "peak_hours", "avg_wait_minutes", "crowd_level", "rating", "access_details", "_schema_version",
+))
+PROVIDER_PROJECTION, PROVIDER_PROJECTION_NAMES = _projection((
+    "provider_name", "guest_policy", "conditions", "notes",
+))
 
 
 class LoungeService:
     """Service class for managing Lounges and AccessProviders in DynamoDB."""
 
+    # Set once the tables have been verified, so later instances in the same container skip the check
+    _tables_verified = False
+
     def __init__(self, lounges_table="Lounges", providers_table="AccessProviders"):
         self.dynamodb = boto3.resource("dynamodb")
         self.lounges_table_name = lounges_table
         self.providers_table_name = providers_table
         self.lounges_table = self.dynamodb.Table(lounges_table)
         self.providers_table = self.dynamodb.Table(providers_table)
+        # airport code -> consolidated lounges response
+        self._lounges_cache = TTLCache(maxsize=LOUNGES_CACHE_MAXSIZE, ttl=LOUNGES_CACHE_TTL_SECONDS)
+        # provider_name -> AccessProviders item, shared across airports
+        self._provider_cache = TTLCache(maxsize=LOUNGES_CACHE_MAXSIZE, ttl=LOUNGES_CACHE_TTL_SECONDS)
+        # airport code -> last good consolidated response, served if DynamoDB errors after the TTL lapses
+        self._stale_lounges = LRUCache(maxsize=LOUNGES_CACHE_MAXSIZE)
+        # airport code -> raw Lounges rows, read by the provider/amenity filters
+        self._airport_rows_cache = TTLCache(maxsize=LOUNGES_CACHE_MAXSIZE, ttl=LOUNGES_CACHE_TTL_SECONDS)
 
-        # Optionally verify the tables exist
-        self._ensure_table_exists(self.lounges_table_name, key_schema=[
-            {"AttributeName": "airport", "KeyType": "HASH"},
-            {"AttributeName": "lounge_id", "KeyType": "RANGE"},
-        ])
-        self._ensure_table_exists(self.providers_table_name, key_schema=[
-            {"AttributeName": "provider_name", "KeyType": "HASH"},
-        ])
+        # Optionally verify the tables exist; off by default so Lambda init skips the DynamoDB calls
+        if os.getenv("LOUNGE_ENSURE_TABLES") == "1" and not LoungeService._tables_verified:
+            self._verify_tables()
 
     # ---------- core queries ----------
 
     def get_lounges_with_access_rules(self, airport_code: str):
         """Return all lounges at an airport merged with their provider rules."""
+        # Responses stay cached, so callers always get their own copy to mutate
+        key = None
         try:
+            key = airport_code.upper()
+            cached = self._lounges_cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
             lounges_resp = self.lounges_table.query(
-                KeyConditionExpression=Key("airport").eq(airport_code.upper())
+                KeyConditionExpression=Key("airport").eq(key),
+                ProjectionExpression=LOUNGE_PROJECTION,
+                ExpressionAttributeNames=LOUNGE_PROJECTION_NAMES
             )
             lounges = lounges_resp.get("Items", [])
             if not lounges:
-                return {"airport": airport_code.upper(), "lounges": []}
+                result = {"airport": key, "lounges": []}
+                self._lounges_cache[key] = self._stale_lounges[key] = result
+                return copy.deepcopy(result)
 
-            # gather providers
+            # rows written before access_details were baked in still need the provider merge;
+            # gather their providers and remember where each detail goes in the same walk
             provider_names = set()
+            slots = []
             for l in lounges:
-                provider_names.update(l.get("access_providers", []))
+                # _schema_version is a storage marker; drop it so it never reaches the tool response
+                if l.pop("_schema_version", 1) >= LOUNGE_SCHEMA_VERSION:
+                    continue
+                aps = l.get("access_providers") or ()
+                details = l["access_details"] = [None] * len(aps)
+                for j, p in enumerate(aps):
+                    provider_names.add(p)
+                    slots.append((details, j, p))
 
-            # batch-get provider policies
+            # batch-get provider policies, only for providers not already cached
             rules = {}
-            keys = [{"provider_name": p} for p in provider_names]
-            for batch in range(0, len(keys), 100):
-                resp = self.dynamodb.batch_get_item(
-                    RequestItems={self.providers_table_name: {"Keys": keys[batch: batch+100]}}
-                )
-                for item in resp["Responses"].get(self.providers_table_name, []):
-                    rules[item["provider_name"]] = item
+            for p in provider_names:
+                item = self._provider_cache.get(p)
+                if item is not None:
+                    rules[p] = item
+            missing = [p for p in provider_names if p not in rules]
+            complete = True
+            if missing:
+                fetched, complete = self._fetch_providers(missing)
+                rules.update(fetched)
+                self._provider_cache.update(fetched)
 
-            # merge into lounges
-            result = []
-            for l in lounges:
-                details = []
-                for prov in l.get("access_providers", []):
-                    r = rules.get(prov, {})
-                    details.append({
-                        "provider_name": prov,
-                        "guest_policy": r.get("guest_policy"),
-                        "conditions": r.get("conditions"),
-                        "notes": r.get("notes")
-                    })
-                l["access_details"] = details
-                result.append(l)
-
-            return {"airport": airport_code.upper(), "lounges": result}
+            # fill in the recorded detail slots
+            empty = {}
+            for details, j, p in slots:
+                r = rules.get(p, empty)
+                details[j] = {
+                    "provider_name": p,
+                    "guest_policy": r.get("guest_policy"),
+                    "conditions": r.get("conditions"),
+                    "notes": r.get("notes")
+                }
+
+            consolidated = {"airport": key, "lounges": lounges}
+            if not complete:
+                # Some access_details lack their provider rules; serve them once but don't cache them
+                return consolidated
+            self._lounges_cache[key] = self._stale_lounges[key] = consolidated
+            return copy.deepcopy(consolidated)
 
         except Exception as e:
-            print(f"Error building consolidated response for {airport_code}: {e}")
-            return {"airport": airport_code.upper(), "lounges": []}
+            stale = self._stale_lounges.get(key) if key is not None else None
+            if stale is not None:
+                logger.warning("Serving stale lounges for %s after error: %s", key, e)
+                return copy.deepcopy(stale)
+            logger.error("Error building consolidated response for %s: %s", airport_code, e)
+            return {"airport": key if key is not None else airport_code, "lounges": []}
+
+    def refresh_access_details(self):
+        """
+        Rewrites every Lounges row with access_details baked in from the current
+        AccessProviders table. Run after changing a provider's policy.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            rules = {p["provider_name"]: p for p in self._scan_all(self.providers_table)}
+            written = self._batch_put(
+                self.lounges_table_name,
+                [self._with_access_details(lounge, rules) for lounge in self._scan_all(self.lounges_table)]
+            )
+
+            self._lounges_cache.clear()
+            self._provider_cache.clear()
+            self._airport_rows_cache.clear()
+            self._stale_lounges.clear()
+            return written
+
+        except Exception as e:
+            logger.error("Error refreshing lounge access details: %s", e)
+            return False
 
     # ---------- helpers ----------
 
+    @staticmethod
+    def _build_access_details(lounge, rules):
+        """Project provider rules onto a lounge's access_providers."""
+        empty = {}
+        get_rule = rules.get
+        details = []
+        for prov in lounge.get("access_providers", ()):
+            r = get_rule(prov, empty)
+            details.append({
+                "provider_name": prov,
+                "guest_policy": r.get("guest_policy"),
+                "conditions": r.get("conditions"),
+                "notes": r.get("notes")
+            })
+        return details
+
+    def _with_access_details(self, lounge, rules):
+        """Return the lounge item with access_details precomputed for storage."""
+        return {
+            **lounge,
+            "access_details": self._build_access_details(lounge, rules),
+            "_schema_version": LOUNGE_SCHEMA_VERSION
+        }
+
+    @staticmethod
+    def _load_seed_data():
+        """Load the bundled sample lounges and providers; numbers become Decimal for DynamoDB."""
+        with open(SEED_DATA_PATH, encoding="utf-8") as f:
+            return json.load(f, parse_float=Decimal)
+
+    def _fetch_providers(self, provider_names):
+        """
+        BatchGetItem provider rows via the low-level client, retrying UnprocessedKeys with backoff.
+        Returns (rules, complete); complete is False if some keys were still unprocessed after the last attempt.
+        """
+        client = self.dynamodb.meta.client
+        table = self.providers_table_name
+        keys = [{"provider_name": {"S": p}} for p in provider_names]
+        rules = {}
+        complete = True
+        for start in range(0, len(keys), BATCH_GET_LIMIT):
+            request = {
+                "Keys": keys[start:start + BATCH_GET_LIMIT],
+                "ProjectionExpression": PROVIDER_PROJECTION,
+                "ExpressionAttributeNames": PROVIDER_PROJECTION_NAMES
+            }
+            for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                resp = client.batch_get_item(RequestItems={table: request})
+                for item in resp.get("Responses", {}).get(table, []):
+                    row = {k: _DESERIALIZER.deserialize(v) for k, v in item.items()}
+                    rules[row["provider_name"]] = row
+                request = resp.get("UnprocessedKeys", {}).get(table)
+                if not request or attempt == BATCH_GET_MAX_ATTEMPTS - 1:
+                    break
+                time.sleep(BATCH_GET_BACKOFF_SECONDS * 2 ** attempt)
+            if request:
+                complete = False
+                logger.error(
+                    "Gave up fetching providers after %d attempts: %s",
+                    BATCH_GET_MAX_ATTEMPTS,
+                    [k["provider_name"]["S"] for k in request["Keys"]]
+                )
+        return rules, complete
+
+    def _batch_put(self, table_name, items):
+        """
+        Serialize items once and write them with BatchWriteItem, retrying unprocessed puts with backoff.
+        Returns False if some puts were still unprocessed after the last attempt.
+        """
+        client = self.dynamodb.meta.client
+        puts = [{"PutRequest": {"Item": _SERIALIZER.serialize(item)["M"]}} for item in items]
+        for start in range(0, len(puts), BATCH_WRITE_LIMIT):
+            pending = {table_name: puts[start:start + BATCH_WRITE_LIMIT]}
+            for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                resp = client.batch_write_item(RequestItems=pending)
+                pending = resp.get("UnprocessedItems") or {}
+                if not pending or attempt == BATCH_GET_MAX_ATTEMPTS - 1:
+                    break
+                time.sleep(BATCH_GET_BACKOFF_SECONDS * 2 ** attempt)
+            if pending:
+                logger.error(
+                    "Gave up writing %d items to %s after %d attempts",
+                    len(pending.get(table_name, ())), table_name, BATCH_GET_MAX_ATTEMPTS
+                )
+                return False
+        return True
+
+    @staticmethod
+    def _scan_all(table):
+        """Scan a whole table, following pagination."""
+        resp = table.scan()
+        items = resp.get("Items", [])
+        while "LastEvaluatedKey" in resp:
+            resp = table.scan(ExclusiveStartKey=resp["LastEvaluatedKey"])
+            items.extend(resp.get("Items", []))
+        return items
+
+    def _verify_tables(self):
+        """Check both tables with one ListTables call, creating only the missing ones."""
+        try:
+            existing = set()
+            for page in self.dynamodb.meta.client.get_paginator("list_tables").paginate():
+                existing.update(page.get("TableNames", []))
+        except Exception as e:
+            logger.error("Error listing tables: %s", e)
+            return
+
+        verified = True
+        if self.lounges_table_name not in existing:
+            verified = self._ensure_table_exists(self.lounges_table_name, key_schema=[
+                {"AttributeName": "airport", "KeyType": "HASH"},
+                {"AttributeName": "lounge_id", "KeyType": "RANGE"},
+            ]) and verified
+        if self.providers_table_name not in existing:
+            verified = self._ensure_table_exists(self.providers_table_name, key_schema=[
+                {"AttributeName": "provider_name", "KeyType": "HASH"},
+            ]) and verified
+        # Only skip the check in later instances once both tables are known to exist
+        if verified:
+            LoungeService._tables_verified = True
+
     def _ensure_table_exists(self, name, key_schema):
-        """Create table if missing (on-demand billing)."""
+        """Create table if missing (on-demand billing). Returns True once the table exists."""
         try:
             tbl = self.dynamodb.Table(name)
             tbl.load()
-            print(f"{name} table found.")
+            logger.info("%s table found.", name)
+            return True
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ResourceNotFoundException":
-                print(f"{name} table not found; creating ...")
-                self.dynamodb.create_table(
-                    TableName=name,
-                    KeySchema=key_schema,
-                    AttributeDefinitions=[
-                        {"AttributeName": k["AttributeName"], "AttributeType": "S"}
-                        for k in key_schema
-                    ],
-                    BillingMode="PAY_PER_REQUEST",
-                ).wait_until_exists()
-                print(f"{name} created.")
-            else:
-                print(f"Error checking {name}: {e}")
+            if e.response["Error"]["Code"] != "ResourceNotFoundException":
+                logger.error("Error checking %s: %s", name, e)
+                return False
+
+        try:
+            logger.info("%s table not found; creating ...", name)
+            self.dynamodb.create_table(
+                TableName=name,
+                KeySchema=key_schema,
+                AttributeDefinitions=[
+                    {"AttributeName": k["AttributeName"], "AttributeType": "S"}
+                    for k in key_schema
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            ).wait_until_exists()
+            logger.info("%s created.", name)
+            return True
+        except Exception as e:
+            logger.error("Error creating %s: %s", name, e)
+            return False
 
     def get_lounges_by_airport(self, airport_code: str):
         """
@@ -105,12 +341,22 @@ class LoungeService:
             list: List of lounges at the airport
         """
         try:
+            key = airport_code.upper()
+            cached = self._airport_rows_cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
             response = self.lounges_table.query(
-                KeyConditionExpression=Key("airport").eq(airport_code.upper())
+                KeyConditionExpression=Key("airport").eq(key)
             )
-            return response.get("Items", [])
+            items = response.get("Items", [])
+            # Whole rows include the v2 storage marker; keep it out of what callers see
+            for item in items:
+                item.pop("_schema_version", None)
+            self._airport_rows_cache[key] = items
+            return copy.deepcopy(items)
         except Exception as e:
-            print(f"Error retrieving lounges for {airport_code}: {e}")
+            logger.error("Error retrieving lounges for %s: %s", airport_code, e)
             return []
 
     def get_lounge_by_id(self, airport_code: str, lounge_id: str):
@@ -133,7 +379,7 @@ class LoungeService:
             )
             return response.get("Item")
         except Exception as e:
-            print(f"Error retrieving lounge {lounge_id} at {airport_code}: {e}")
+            logger.error("Error retrieving lounge %s at %s: %s", lounge_id, airport_code, e)
             return None
 
     def create_sample_lounges(self):
@@ -144,109 +390,26 @@ class LoungeService:
             bool: True if successful, False otherwise
         """
         try:
-            # Sample lounges data
-            sample_lounges = [
-                {
-                    "airport": "JFK",
-                    "lounge_id": "JFK_DELTA_SKY_CLUB_T4",
-                    "name": "Delta Sky Club Terminal 4",
-                    "terminal": "Terminal 4",
-                    "access_providers": ["Delta SkyMiles", "Amex Platinum", "Priority Pass"],
-                    "amenities": ["Buffet", "WiFi", "Showers", "Business Center"],
-                    "hours": "05:00-23:00",
-                    "peak_hours": "07:00-10:00,17:00-20:00",
-                    "avg_wait_minutes": 15,
-                    "crowd_level": "Medium",
-                    "rating": 4.2
-                },
-                {
-                    "airport": "JFK",
-                    "lounge_id": "JFK_AMEX_CENTURION_T4",
-                    "name": "American Express Centurion Lounge Terminal 4",
-                    "terminal": "Terminal 4",
-                    "access_providers": ["Amex Platinum", "Amex Centurion"],
-                    "amenities": ["Fine Dining", "WiFi", "Showers", "Spa", "Business Center"],
-                    "hours": "05:30-22:30",
-                    "peak_hours": "08:00-11:00,18:00-21:00",
-                    "avg_wait_minutes": 25,
-                    "crowd_level": "High",
-                    "rating": 4.8
-                },
-                {
-                    "airport": "LAX",
-                    "lounge_id": "LAX_STAR_ALLIANCE_TBIT",
-                    "name": "Star Alliance Lounge TBIT",
-                    "terminal": "TBIT",
-                    "access_providers": ["Star Alliance Gold", "Priority Pass"],
-                    "amenities": ["Buffet", "WiFi", "Quiet Zones", "Business Center"],
-                    "hours": "06:00-22:00",
-                    "peak_hours": "09:00-12:00,16:00-19:00",
-                    "avg_wait_minutes": 10,
-                    "crowd_level": "Low",
-                    "rating": 4.0
-                },
-                {
-                    "airport": "ORD",
-                    "lounge_id": "ORD_UNITED_CLUB_T1",
-                    "name": "United Club Terminal 1",
-                    "terminal": "Terminal 1",
-                    "access_providers": ["United Club", "Chase Sapphire Reserve", "Priority Pass"],
-                    "amenities": ["Buffet", "WiFi", "Showers", "Quiet Zones"],
-                    "hours": "05:00-23:30",
-                    "peak_hours": "07:00-10:00,17:00-20:00",
-                    "avg_wait_minutes": 12,
-                    "crowd_level": "Medium",
-                    "rating": 3.9
-                }
-            ]
-
-            # Sample access providers
-            sample_providers = [
-                {
-                    "provider_name": "Amex Platinum",
-                    "guest_policy": "2 guests free, additional $50 each",
-                    "conditions": "Must be traveling same day",
-                    "notes": "Primary cardholder must be present"
-                },
-                {
-                    "provider_name": "Priority Pass",
-                    "guest_policy": "Guests $32 each",
-                    "conditions": "Must be traveling same day",
-                    "notes": "Digital card accepted"
-                },
-                {
-                    "provider_name": "Chase Sapphire Reserve",
-                    "guest_policy": "2 guests free, additional $27 each",
-                    "conditions": "Must be traveling same day",
-                    "notes": "Primary cardholder must be present"
-                },
-                {
-                    "provider_name": "Delta SkyMiles",
-                    "guest_policy": "Varies by status",
-                    "conditions": "Flying Delta same day",
-                    "notes": "Status-dependent benefits"
-                },
-                {
-                    "provider_name": "United Club",
-                    "guest_policy": "2 guests $59 each",
-                    "conditions": "Flying United same day",
-                    "notes": "Members and eligible passengers only"
-                }
-            ]
+            seed = self._load_seed_data()
 
-            # Insert lounges
-            with self.lounges_table.batch_writer() as batch:
-                for lounge in sample_lounges:
-                    batch.put_item(Item=lounge)
+            # Insert lounges with access details precomputed from the seed providers
+            rules = {p["provider_name"]: p for p in seed["providers"]}
+            written = self._batch_put(
+                self.lounges_table_name,
+                [self._with_access_details(lounge, rules) for lounge in seed["lounges"]]
+            )
 
             # Insert access providers
-            with self.providers_table.batch_writer() as batch:
-                for provider in sample_providers:
-                    batch.put_item(Item=provider)
+            written = self._batch_put(self.providers_table_name, seed["providers"]) and written
 
-            print("Successfully created sample lounges and access providers")
-            return True
+            self._lounges_cache.clear()
+            self._provider_cache.clear()
+            self._airport_rows_cache.clear()
+            self._stale_lounges.clear()
+            if written:
+                logger.info("Successfully created sample lounges and access providers")
+            return written
 
         except Exception as e:
-            print(f"Error creating sample lounges: {e}")
+            logger.error("Error creating sample lounges: %s", e)
             return False
@@ -1,6 +1,29 @@
 """
 This module defines tools that interact with an external API client.
 """
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ["get_user", "get_lounges_with_access_rules", "get_flight_schedule"]
+
+# Reused across warm invocations for the user lookup that overlaps the lounge query
+_LOUNGE_LOOKUP_POOL = ThreadPoolExecutor(max_workers=2)
+
+
+def _lounges_available(airport, api_client):
+    """Return whether an airport has any lounges, or None if the lookup failed."""
+    try:
+        return bool(api_client.get_lounges_by_airport(airport).get("lounges"))
+    except Exception:
+        return None
+
+
+def _user_or_none(future):
+    """Return the user from a profile lookup, or None if it failed."""
+    try:
+        return future.result()
+    except Exception:
+        return None
+
 
 def get_user(user_id, api_client):
     """
@@ -28,25 +51,38 @@ def get_user(user_id, api_client):
     }
 
 
-def get_lounges_with_access_rules(airport, api_client):
+def get_lounges_with_access_rules(airport, api_client, user_id=None):
     """
     Retrieves lounges for a given airport with detailed access rules.
     
     Args:
         airport (str): The airport code (e.g., 'LAX', 'JFK')
         api_client: The API client instance for data retrieval
+        user_id (str, optional): Also return this user's profile, fetched alongside the lounges
         
     Returns:
         dict: Airport lounges with access rules and detailed information
     """
+    # The user lookup is independent of the lounge query, so overlap the two
+    user_future = _LOUNGE_LOOKUP_POOL.submit(api_client.get_user, user_id) if user_id else None
+    result = _lounges_result(airport, api_client)
+    if user_future is not None:
+        # A failed profile lookup must not fail the lounge search
+        result["user"] = _user_or_none(user_future)
+    return result
+
+
+def _lounges_result(airport, api_client):
+    """Build the get_lounges_with_access_rules response for an airport."""
     try:
         lounges_data = api_client.get_lounges_by_airport(airport)
         
         if lounges_data:
+            lounges = lounges_data.get("lounges") or []
             return {
                 "airport": airport,
-                "lounges": lounges_data.get("lounges", []),
-                "total_lounges": len(lounges_data.get("lounges", [])),
+                "lounges": lounges,
+                "total_lounges": len(lounges),
                 "status": "success"
             }
         
@@ -102,20 +138,13 @@ def get_flight_schedule(carrier_code, flight_number, scheduled_departure_date, a
                 "status": "success"
             }
             
-            # Optionally add lounge availability information
+            # Optionally add lounge availability information. The lookups share one LoungeService
+            # (its boto3 Table and unlocked caches), so they run one after the other
             if departure_airport:
-                try:
-                    departure_lounges = api_client.get_lounges_by_airport(departure_airport)
-                    result["departure_lounges_available"] = bool(departure_lounges.get("lounges"))
-                except:
-                    result["departure_lounges_available"] = None
+                result["departure_lounges_available"] = _lounges_available(departure_airport, api_client)
             
             if arrival_airport:
-                try:
-                    arrival_lounges = api_client.get_lounges_by_airport(arrival_airport)
-                    result["arrival_lounges_available"] = bool(arrival_lounges.get("lounges"))
-                except:
-                    result["arrival_lounges_available"] = None
+                result["arrival_lounges_available"] = _lounges_available(arrival_airport, api_client)
             
             return result
         
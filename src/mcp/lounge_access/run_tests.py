@@ -10,118 +10,57 @@ import os
 
 # Add the current directory to the path
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, CURRENT_DIR)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
 
-def run_api_client_tests():
-    """Run tests for the API client."""
-    print("=" * 60)
-    print("Running API Client Tests")
-    print("=" * 60)
-    
-    # Import and run the API client tests
-    from test_api_client import (
-        TestLoungeAccessClientGetUser,
-        TestLoungeAccessClientCreateSampleUsers,
-        TestLoungeAccessClientInitialization,
-        TestLoungeAccessClientIntegration,
-        TestLoungeAccessClientLoungeOperations,
-        TestLoungeAccessClientLoungeMethods
+# Human-readable names for the summary; modules not listed are shown by module name
+SUITE_LABELS = {
+    "test_api_client": "API Client",
+    "test_lounge_service": "Lounge Service",
+    "test_lambda_handler": "Lambda Handler",
+    "test_flight_schedule": "Flight Schedule",
+    "test_user_profile_service": "User Profile Service",
+}
+
+
+def discover_tests():
+    """Collect every TestCase from the test_*.py modules next to this script."""
+    return unittest.defaultTestLoader.discover(
+        start_dir=CURRENT_DIR,
+        pattern="test_*.py",
+        top_level_dir=CURRENT_DIR
     )
-    
-    # Create test suite
-    suite = unittest.TestSuite()
-    
-    # Add all test classes
-    test_classes = [
-        TestLoungeAccessClientGetUser,
-        TestLoungeAccessClientCreateSampleUsers,
-        TestLoungeAccessClientInitialization,
-        TestLoungeAccessClientIntegration,
-        TestLoungeAccessClientLoungeOperations,
-        TestLoungeAccessClientLoungeMethods
-    ]
-    
-    for test_class in test_classes:
-        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-        suite.addTests(tests)
-    
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2, buffer=True)
-    result = runner.run(suite)
-    
-    return result.wasSuccessful()
 
 
-def run_lounge_service_tests():
-    """Run tests for the lounge service."""
-    print("\n" + "=" * 60)
-    print("Running Lounge Service Tests")
-    print("=" * 60)
+def iter_tests(suite):
+    """Flatten a discovered suite into individual test cases."""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+
+def run_all_tests():
+    """
+    Run every discovered test in one pass.
     
-    try:
-        # Import and run the lounge service tests
-        from test_lounge_service import (
-            TestLoungeServiceInitialization,
-            TestLoungeServiceGetLoungesWithAccessRules,
-            TestLoungeServiceGetLoungesByAirport,
-            TestLoungeServiceGetLoungeById,
-            TestLoungeServiceCreateSampleLounges,
-            TestLoungeServiceTableManagement,
-            TestLoungeServiceIntegration
-        )
-        
-        # Create test suite
-        suite = unittest.TestSuite()
-        
-        # Add all test classes
-        test_classes = [
-            TestLoungeServiceInitialization,
-            TestLoungeServiceGetLoungesWithAccessRules,
-            TestLoungeServiceGetLoungesByAirport,
-            TestLoungeServiceGetLoungeById,
-            TestLoungeServiceCreateSampleLounges,
-            TestLoungeServiceTableManagement,
-            TestLoungeServiceIntegration
-        ]
-        
-        for test_class in test_classes:
-            tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-            suite.addTests(tests)
-        
-        # Run tests
-        runner = unittest.TextTestRunner(verbosity=2, buffer=True)
-        result = runner.run(suite)
-        
-        return result.wasSuccessful()
-        
-    except ImportError as e:
-        print(f"Could not import lounge service tests: {e}")
-        return True  # Don't fail the entire test run
-
-
-def run_lambda_handler_tests():
-    """Run tests for the lambda handler."""
-    print("\n" + "=" * 60)
-    print("Running Lambda Handler Tests")
-    print("=" * 60)
+    Returns:
+        dict: module name -> True if all of its tests passed
+    """
+    suite = discover_tests()
+    # Listed before running: suites release their tests as they finish
+    tests = list(iter_tests(suite))
+    runner = unittest.TextTestRunner(verbosity=2, buffer=True)
+    result = runner.run(suite)
     
-    try:
-        # Import and run the lambda handler tests
-        from test_lambda_handler import TestLambdaHandler
-        
-        # Create test suite
-        suite = unittest.TestLoader().loadTestsFromTestCase(TestLambdaHandler)
-        
-        # Run tests
-        runner = unittest.TextTestRunner(verbosity=2, buffer=True)
-        result = runner.run(suite)
-        
-        return result.wasSuccessful()
-        
-    except ImportError as e:
-        print(f"Could not import lambda handler tests: {e}")
-        return True  # Don't fail the entire test run
+    failed_ids = {test.id() for test, _ in result.failures + result.errors}
+    outcomes = {}
+    for test in tests:
+        module = type(test).__module__
+        outcomes[module] = outcomes.get(module, True) and test.id() not in failed_ids
+    return outcomes
 
 
 def run_coverage_report():
@@ -149,32 +88,17 @@ def main():
     print("LoungeAccessAdvisor MCP Tools - Test Suite")
     print("=" * 60)
     
+    outcomes = run_all_tests()
     success_count = 0
-    total_tests = 0
-    
-    # Run API client tests
-    if run_api_client_tests():
-        success_count += 1
-        print("✅ API Client tests passed")
-    else:
-        print("❌ API Client tests failed")
-    total_tests += 1
+    total_tests = len(outcomes)
     
-    # Run lounge service tests
-    if run_lounge_service_tests():
-        success_count += 1
-        print("✅ Lounge Service tests passed")
-    else:
-        print("❌ Lounge Service tests failed")
-    total_tests += 1
-
-    # Run lambda handler tests
-    if run_lambda_handler_tests():
-        success_count += 1
-        print("✅ Lambda Handler tests passed")
-    else:
-        print("❌ Lambda Handler tests failed")
-    total_tests += 1
+    for module, passed in outcomes.items():
+        label = SUITE_LABELS.get(module, module)
+        if passed:
+            success_count += 1
+            print(f"✅ {label} tests passed")
+        else:
+            print(f"❌ {label} tests failed")
     
     # Show coverage information
     run_coverage_report()
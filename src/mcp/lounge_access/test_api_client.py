@@ -4,32 +4,46 @@ Tests the get_user method and its integration with UserProfileService.
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, call, patch
 import sys
 import os
 
 # Add the current directory to the path to import local modules
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, CURRENT_DIR)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
 from api_client import LoungeAccessClient
 
+LONG_USER_ID = "LAA_" + "A" * 1000  # Very long user ID
 
-class TestLoungeAccessClientGetUser(unittest.TestCase):
-    """Test cases for the get_user method in LoungeAccessClient."""
+
+class MockedServicesTestCase(unittest.TestCase):
+    """
+    Builds a LoungeAccessClient over fresh service mocks for every test.
+    The service classes are patched once per class rather than once per test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Patch UserProfileService and LoungeService to avoid actual AWS calls."""
+        cls._service_patchers = [patch('api_client.UserProfileService'), patch('api_client.LoungeService')]
+        cls._user_service_class, cls._lounge_service_class = [p.start() for p in cls._service_patchers]
+
+    @classmethod
+    def tearDownClass(cls):
+        for patcher in cls._service_patchers:
+            patcher.stop()
 
     def setUp(self):
         """Set up test fixtures before each test method."""
-        # Mock both UserProfileService and LoungeService to avoid actual AWS calls
-        with patch('api_client.UserProfileService') as mock_user_service_class, \
-             patch('api_client.LoungeService') as mock_lounge_service_class:
-            
-            self.mock_service_instance = Mock()
-            self.mock_lounge_service_instance = Mock()
-            mock_user_service_class.return_value = self.mock_service_instance
-            mock_lounge_service_class.return_value = self.mock_lounge_service_instance
-            
-            self.client = LoungeAccessClient()
+        self.mock_user_service_instance = self._user_service_class.return_value = Mock()
+        self.mock_lounge_service_instance = self._lounge_service_class.return_value = Mock()
+        self.client = LoungeAccessClient()
+
+
+class TestLoungeAccessClientGetUser(MockedServicesTestCase):
+    """Test cases for the get_user method in LoungeAccessClient."""
 
     def test_get_user_success(self):
         """Test successful user retrieval."""
@@ -40,74 +54,41 @@ class TestLoungeAccessClientGetUser(unittest.TestCase):
             "home_airport": "JFK",
             "memberships": ["priority_pass", "amex_platinum"]
         }
-        self.mock_service_instance.get_user.return_value = expected_user
+        self.mock_user_service_instance.get_user.return_value = expected_user
 
         # Act
         result = self.client.get_user("LAA_001")
 
         # Assert
-        self.assertEqual(result, expected_user)
-        self.mock_service_instance.get_user.assert_called_once_with("LAA_001")
+        self.assertIs(result, expected_user)
+        self.mock_user_service_instance.get_user.assert_called_once_with("LAA_001")
 
     def test_get_user_not_found(self):
-        """Test user retrieval when user doesn't exist."""
-        # Arrange
-        self.mock_service_instance.get_user.return_value = None
+        """Test unknown, empty, None, whitespace and very long user_ids are passed through unchanged."""
+        for user_id in ("NONEXISTENT_USER", "", None, "   ", LONG_USER_ID):
+            with self.subTest(user_id=user_id if user_id != LONG_USER_ID else "LONG_USER_ID"):
+                # Arrange
+                self.mock_user_service_instance.get_user.reset_mock()
+                self.mock_user_service_instance.get_user.return_value = None
 
-        # Act
-        result = self.client.get_user("NONEXISTENT_USER")
-
-        # Assert
-        self.assertIsNone(result)
-        self.mock_service_instance.get_user.assert_called_once_with("NONEXISTENT_USER")
+                # Act
+                result = self.client.get_user(user_id)
 
-    def test_get_user_empty_string(self):
-        """Test user retrieval with empty string user_id."""
-        # Arrange
-        self.mock_service_instance.get_user.return_value = None
-
-        # Act
-        result = self.client.get_user("")
-
-        # Assert
-        self.assertIsNone(result)
-        self.mock_service_instance.get_user.assert_called_once_with("")
-
-    def test_get_user_none_parameter(self):
-        """Test user retrieval with None as user_id."""
-        # Arrange
-        self.mock_service_instance.get_user.return_value = None
-
-        # Act
-        result = self.client.get_user(None)
-
-        # Assert
-        self.assertIsNone(result)
-        self.mock_service_instance.get_user.assert_called_once_with(None)
-
-    def test_get_user_whitespace_parameter(self):
-        """Test user retrieval with whitespace-only user_id."""
-        # Arrange
-        self.mock_service_instance.get_user.return_value = None
-
-        # Act
-        result = self.client.get_user("   ")
-
-        # Assert
-        self.assertIsNone(result)
-        self.mock_service_instance.get_user.assert_called_once_with("   ")
+                # Assert
+                self.assertIsNone(result)
+                self.mock_user_service_instance.get_user.assert_called_once_with(user_id)
 
     def test_get_user_service_exception(self):
         """Test user retrieval when service raises an exception."""
         # Arrange
-        self.mock_service_instance.get_user.side_effect = Exception("Database connection error")
+        self.mock_user_service_instance.get_user.side_effect = Exception("Database connection error")
 
         # Act & Assert
         with self.assertRaises(Exception) as context:
             self.client.get_user("LAA_001")
 
         self.assertEqual(str(context.exception), "Database connection error")
-        self.mock_service_instance.get_user.assert_called_once_with("LAA_001")
+        self.mock_user_service_instance.get_user.assert_called_once_with("LAA_001")
 
     def test_get_user_multiple_calls(self):
         """Test multiple user retrievals to ensure service is called correctly."""
@@ -125,15 +106,8 @@ class TestLoungeAccessClientGetUser(unittest.TestCase):
             "memberships": ["chase_sapphire", "priority_pass"]
         }
         
-        # Configure mock to return different users based on input
-        def mock_get_user(user_id):
-            if user_id == "LAA_001":
-                return user1
-            elif user_id == "LAA_002":
-                return user2
-            return None
-        
-        self.mock_service_instance.get_user.side_effect = mock_get_user
+        # One canned result per call, in call order
+        self.mock_user_service_instance.get_user.side_effect = [user1, user2, None]
 
         # Act
         result1 = self.client.get_user("LAA_001")
@@ -147,12 +121,12 @@ class TestLoungeAccessClientGetUser(unittest.TestCase):
         
         # Verify all calls were made
         expected_calls = [
-            unittest.mock.call("LAA_001"),
-            unittest.mock.call("LAA_002"),
-            unittest.mock.call("LAA_999")
+            call("LAA_001"),
+            call("LAA_002"),
+            call("LAA_999")
         ]
-        self.mock_service_instance.get_user.assert_has_calls(expected_calls)
-        self.assertEqual(self.mock_service_instance.get_user.call_count, 3)
+        self.mock_user_service_instance.get_user.assert_has_calls(expected_calls)
+        self.assertEqual(self.mock_user_service_instance.get_user.call_count, 3)
 
     def test_get_user_partial_data(self):
         """Test user retrieval with partial user data."""
@@ -163,16 +137,16 @@ class TestLoungeAccessClientGetUser(unittest.TestCase):
             "home_airport": None,  # Missing home airport
             "memberships": []  # Empty memberships
         }
-        self.mock_service_instance.get_user.return_value = partial_user
+        self.mock_user_service_instance.get_user.return_value = partial_user
 
         # Act
         result = self.client.get_user("LAA_003")
 
         # Assert
-        self.assertEqual(result, partial_user)
+        self.assertIs(result, partial_user)
         self.assertIsNone(result["home_airport"])
         self.assertEqual(result["memberships"], [])
-        self.mock_service_instance.get_user.assert_called_once_with("LAA_003")
+        self.mock_user_service_instance.get_user.assert_called_once_with("LAA_003")
 
     def test_get_user_special_characters(self):
         """Test user retrieval with special characters in user_id."""
@@ -184,80 +158,54 @@ class TestLoungeAccessClientGetUser(unittest.TestCase):
             "home_airport": "JFK",
             "memberships": ["priority_pass"]
         }
-        self.mock_service_instance.get_user.return_value = expected_user
+        self.mock_user_service_instance.get_user.return_value = expected_user
 
         # Act
         result = self.client.get_user(special_user_id)
 
         # Assert
         self.assertEqual(result, expected_user)
-        self.mock_service_instance.get_user.assert_called_once_with(special_user_id)
-
-    def test_get_user_long_user_id(self):
-        """Test user retrieval with very long user_id."""
-        # Arrange
-        long_user_id = "LAA_" + "A" * 1000  # Very long user ID
-        self.mock_service_instance.get_user.return_value = None
-
-        # Act
-        result = self.client.get_user(long_user_id)
-
-        # Assert
-        self.assertIsNone(result)
-        self.mock_service_instance.get_user.assert_called_once_with(long_user_id)
+        self.mock_user_service_instance.get_user.assert_called_once_with(special_user_id)
 
 
-class TestLoungeAccessClientCreateSampleUsers(unittest.TestCase):
+class TestLoungeAccessClientCreateSampleUsers(MockedServicesTestCase):
     """Test cases for the create_sample_users method in LoungeAccessClient."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        # Mock both UserProfileService and LoungeService to avoid actual AWS calls
-        with patch('api_client.UserProfileService') as mock_user_service_class, \
-             patch('api_client.LoungeService') as mock_lounge_service_class:
-            
-            self.mock_service_instance = Mock()
-            self.mock_lounge_service_instance = Mock()
-            mock_user_service_class.return_value = self.mock_service_instance
-            mock_lounge_service_class.return_value = self.mock_lounge_service_instance
-            
-            self.client = LoungeAccessClient()
-
     def test_create_sample_users_success(self):
         """Test successful creation of sample users."""
         # Arrange
-        self.mock_service_instance.create_sample_users.return_value = True
+        self.mock_user_service_instance.create_sample_users.return_value = True
 
         # Act
         result = self.client.create_sample_users()
 
         # Assert
         self.assertTrue(result)
-        self.mock_service_instance.create_sample_users.assert_called_once()
+        self.mock_user_service_instance.create_sample_users.assert_called_once()
 
     def test_create_sample_users_failure(self):
         """Test failed creation of sample users."""
         # Arrange
-        self.mock_service_instance.create_sample_users.return_value = False
+        self.mock_user_service_instance.create_sample_users.return_value = False
 
         # Act
         result = self.client.create_sample_users()
 
         # Assert
         self.assertFalse(result)
-        self.mock_service_instance.create_sample_users.assert_called_once()
+        self.mock_user_service_instance.create_sample_users.assert_called_once()
 
     def test_create_sample_users_exception(self):
         """Test create_sample_users when service raises an exception."""
         # Arrange
-        self.mock_service_instance.create_sample_users.side_effect = Exception("DynamoDB error")
+        self.mock_user_service_instance.create_sample_users.side_effect = Exception("DynamoDB error")
 
         # Act & Assert
         with self.assertRaises(Exception) as context:
             self.client.create_sample_users()
 
         self.assertEqual(str(context.exception), "DynamoDB error")
-        self.mock_service_instance.create_sample_users.assert_called_once()
+        self.mock_user_service_instance.create_sample_users.assert_called_once()
 
 
 class TestLoungeAccessClientInitialization(unittest.TestCase):
@@ -288,6 +236,23 @@ class TestLoungeAccessClientInitialization(unittest.TestCase):
         mock_get_client.assert_called_once()
         self.assertIsNone(client.api_client)
 
+    @patch('api_client.FlightsApiClient')
+    @patch('api_client.LoungeService')
+    @patch('api_client.UserProfileService')
+    def test_initialization_defers_flights_client(self, mock_user_service, mock_lounge_service, mock_flights_class):
+        """Test that the Amadeus client is only built on the first flight lookup."""
+        # Arrange
+        client = LoungeAccessClient()
+        mock_flights_class.assert_not_called()
+
+        # Act
+        client.get_flight_schedule("AA", "1234", "2025-12-25")
+        client.get_flight_schedule("AA", "1234", "2025-12-26")
+
+        # Assert
+        mock_flights_class.assert_called_once_with()
+        self.assertEqual(mock_flights_class.return_value.get_flight_schedule.call_count, 2)
+
 
 class TestLoungeAccessClientIntegration(unittest.TestCase):
     """Integration tests for LoungeAccessClient (with minimal mocking)."""
@@ -326,22 +291,9 @@ class TestLoungeAccessClientIntegration(unittest.TestCase):
             mock_service_instance.create_sample_users.assert_called_once()
 
 
-class TestLoungeAccessClientLoungeOperations(unittest.TestCase):
+class TestLoungeAccessClientLoungeOperations(MockedServicesTestCase):
     """Test cases for lounge-related methods in LoungeAccessClient."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        # Mock both UserProfileService and LoungeService
-        with patch('api_client.UserProfileService') as mock_user_service_class, \
-             patch('api_client.LoungeService') as mock_lounge_service_class:
-            
-            self.mock_user_service_instance = Mock()
-            self.mock_lounge_service_instance = Mock()
-            mock_user_service_class.return_value = self.mock_user_service_instance
-            mock_lounge_service_class.return_value = self.mock_lounge_service_instance
-            
-            self.client = LoungeAccessClient()
-
     def test_get_lounges_by_airport_success(self):
         """Test successful lounge retrieval by airport."""
         # Arrange
@@ -365,34 +317,19 @@ class TestLoungeAccessClientLoungeOperations(unittest.TestCase):
         result = self.client.get_lounges_by_airport("JFK")
 
         # Assert
-        self.assertEqual(result, expected_lounges)
+        self.assertIs(result, expected_lounges)
         self.mock_lounge_service_instance.get_lounges_with_access_rules.assert_called_once_with("JFK")
 
-    def test_get_lounges_by_airport_empty_airport_code(self):
-        """Test lounge retrieval with empty airport code."""
-        # Act
-        result = self.client.get_lounges_by_airport("")
+    def test_get_lounges_by_airport_invalid_airport_code(self):
+        """Test lounge retrieval with empty, None and non-string airport codes."""
+        for airport_code in ("", None, 123):
+            with self.subTest(airport_code=airport_code):
+                # Act
+                result = self.client.get_lounges_by_airport(airport_code)
 
-        # Assert
-        self.assertEqual(result, [])
-        self.mock_lounge_service_instance.get_lounges_with_access_rules.assert_not_called()
+                # Assert
+                self.assertEqual(result, [])
 
-    def test_get_lounges_by_airport_none_airport_code(self):
-        """Test lounge retrieval with None airport code."""
-        # Act
-        result = self.client.get_lounges_by_airport(None)
-
-        # Assert
-        self.assertEqual(result, [])
-        self.mock_lounge_service_instance.get_lounges_with_access_rules.assert_not_called()
-
-    def test_get_lounges_by_airport_invalid_type(self):
-        """Test lounge retrieval with non-string airport code."""
-        # Act
-        result = self.client.get_lounges_by_airport(123)
-
-        # Assert
-        self.assertEqual(result, [])
         self.mock_lounge_service_instance.get_lounges_with_access_rules.assert_not_called()
 
     def test_get_lounge_by_id_success(self):
@@ -413,7 +350,7 @@ class TestLoungeAccessClientLoungeOperations(unittest.TestCase):
         result = self.client.get_lounge_by_id("JFK", "JFK_DELTA_SKY_CLUB_T4")
 
         # Assert
-        self.assertEqual(result, expected_lounge)
+        self.assertIs(result, expected_lounge)
         self.mock_lounge_service_instance.get_lounge_by_id.assert_called_once_with("JFK", "JFK_DELTA_SKY_CLUB_T4")
 
     def test_get_lounge_by_id_not_found(self):
@@ -428,32 +365,22 @@ class TestLoungeAccessClientLoungeOperations(unittest.TestCase):
         self.assertIsNone(result)
         self.mock_lounge_service_instance.get_lounge_by_id.assert_called_once_with("JFK", "NONEXISTENT_LOUNGE")
 
-    def test_get_lounge_by_id_empty_parameters(self):
-        """Test lounge retrieval with empty parameters."""
-        # Test empty airport code
-        result1 = self.client.get_lounge_by_id("", "JFK_DELTA_SKY_CLUB_T4")
-        self.assertIsNone(result1)
-
-        # Test empty lounge ID
-        result2 = self.client.get_lounge_by_id("JFK", "")
-        self.assertIsNone(result2)
-
-        # Test both empty
-        result3 = self.client.get_lounge_by_id("", "")
-        self.assertIsNone(result3)
-
-        # Assert service was not called
-        self.mock_lounge_service_instance.get_lounge_by_id.assert_not_called()
-
-    def test_get_lounge_by_id_none_parameters(self):
-        """Test lounge retrieval with None parameters."""
-        # Test None airport code
-        result1 = self.client.get_lounge_by_id(None, "JFK_DELTA_SKY_CLUB_T4")
-        self.assertIsNone(result1)
+    def test_get_lounge_by_id_invalid_parameters(self):
+        """Test lounge retrieval with empty or None parameters."""
+        cases = [
+            ("", "JFK_DELTA_SKY_CLUB_T4"),
+            ("JFK", ""),
+            ("", ""),
+            (None, "JFK_DELTA_SKY_CLUB_T4"),
+            ("JFK", None),
+        ]
+        for airport_code, lounge_id in cases:
+            with self.subTest(airport_code=airport_code, lounge_id=lounge_id):
+                # Act
+                result = self.client.get_lounge_by_id(airport_code, lounge_id)
 
-        # Test None lounge ID
-        result2 = self.client.get_lounge_by_id("JFK", None)
-        self.assertIsNone(result2)
+                # Assert
+                self.assertIsNone(result)
 
         # Assert service was not called
         self.mock_lounge_service_instance.get_lounge_by_id.assert_not_called()
@@ -720,21 +647,9 @@ class TestLoungeAccessClientLoungeOperations(unittest.TestCase):
         self.mock_lounge_service_instance.get_lounges_by_airport.assert_called_once_with("JFK")
 
 
-class TestLoungeAccessClientLoungeMethods(unittest.TestCase):
+class TestLoungeAccessClientLoungeMethods(MockedServicesTestCase):
     """Additional test cases for lounge functionality and edge cases."""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        with patch('api_client.UserProfileService') as mock_user_service_class, \
-             patch('api_client.LoungeService') as mock_lounge_service_class:
-            
-            self.mock_user_service_instance = Mock()
-            self.mock_lounge_service_instance = Mock()
-            mock_user_service_class.return_value = self.mock_user_service_instance
-            mock_lounge_service_class.return_value = self.mock_lounge_service_instance
-            
-            self.client = LoungeAccessClient()
-
     def test_search_with_partial_provider_name_match(self):
         """Test that partial matches work for access providers."""
         # Arrange
@@ -2,18 +2,23 @@
 Test module for flight schedule functionality
 """
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import json
+import asyncio
 from datetime import datetime
 import sys
 import os
 
 # Ensure the tests can import modules from this package directory
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, CURRENT_DIR)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
+import flights_api_client
+import lambda_handler as lambda_handler_module
 from flights_api_client import FlightsApiClient
 from lambda_handler import lambda_handler
+from mcp_handler import get_flight_schedule as mcp_get_flight_schedule
 from types import SimpleNamespace
 
 
@@ -28,6 +33,8 @@ def make_context(tool_name=None):
 class TestFlightsApiClient(unittest.TestCase):
     
     def setUp(self):
+        # Drop the shared Secrets Manager client so each test sees its own boto3 patch
+        flights_api_client._SM_CLIENT = None
         self.client = FlightsApiClient()
     
     def test_validate_flight_parameters_valid(self):
@@ -53,7 +60,25 @@ class TestFlightsApiClient(unittest.TestCase):
         result = self.client.validate_flight_parameters("AA", "1234", "25-12-2025")
         self.assertFalse(result["is_valid"])
         self.assertIn("Scheduled departure date must be in YYYY-MM-DD format", result["errors"])
-    
+
+    def test_validate_flight_parameters_impossible_date(self):
+        """Test flight parameter validation rejects well-formed but non-existent dates"""
+        result = self.client.validate_flight_parameters("aa", "1234", "2025-02-30")
+        self.assertFalse(result["is_valid"])
+        self.assertEqual(result["errors"], ["Scheduled departure date must be in YYYY-MM-DD format"])
+
+    def test_validate_flight_parameters_flight_number_too_long(self):
+        """Test flight parameter validation with more than 4 digits"""
+        result = self.client.validate_flight_parameters("AA", "12345", "2025-12-25")
+        self.assertFalse(result["is_valid"])
+        self.assertIn("Flight number must be at most 4 digits", result["errors"])
+
+    def test_validate_flight_parameters_non_ascii_digits(self):
+        """Test flight parameter validation rejects non-ASCII digits as non-numeric"""
+        result = self.client.validate_flight_parameters("AA", "\u0661\u0662\u0663", "2025-12-25")
+        self.assertFalse(result["is_valid"])
+        self.assertEqual(result["errors"], ["Flight number must contain only numeric characters"])
+
     def test_validate_flight_parameters_multiple_errors(self):
         """Test flight parameter validation with multiple invalid inputs"""
         result = self.client.validate_flight_parameters("", "ABC", "invalid-date")
@@ -61,8 +86,8 @@ class TestFlightsApiClient(unittest.TestCase):
         self.assertEqual(len(result["errors"]), 3)
     
     @patch("flights_api_client.boto3.client")
-    @patch("flights_api_client.requests.post")
-    @patch("flights_api_client.requests.get")
+    @patch("flights_api_client._HTTP.post")
+    @patch("flights_api_client._HTTP.get")
     def test_get_flight_schedule_success(self, mock_get, mock_post, mock_boto_client):
         """Test successful flight schedule retrieval"""
         # Mock secrets manager
@@ -89,7 +114,7 @@ class TestFlightsApiClient(unittest.TestCase):
                 "operatingCarrier": {"carrierCode": "AA"}
             }]
         }
-        mock_get.return_value.json.return_value = mock_flight_response
+        mock_get.return_value.content = json.dumps(mock_flight_response).encode()
         mock_get.return_value.raise_for_status = MagicMock()
         
         result = self.client.get_flight_schedule("AA", "1234", "2025-12-25")
@@ -112,8 +137,199 @@ class TestFlightsApiClient(unittest.TestCase):
         self.assertEqual(result["status"], "error")
         self.assertIn("error", result)
 
+    def test_map_schedule_response_projects_segments_and_legs(self):
+        """Test the mapped schedule carries projected segments/legs and no raw payload"""
+        flight_data = {
+            "data": [{
+                "flightPoints": [{"iataCode": "JFK"}, {"iataCode": "LAX"}],
+                "segments": [{
+                    "boardPointIataCode": "JFK",
+                    "offPointIataCode": "LAX",
+                    "scheduledSegmentDuration": "PT6H",
+                    "partnership": {"operatingFlight": {"carrierCode": "AS", "flightNumber": 99}}
+                }],
+                "legs": [{
+                    "boardPointIataCode": "JFK",
+                    "offPointIataCode": "LAX",
+                    "aircraftEquipment": {"aircraftType": "321"},
+                    "scheduledLegDuration": "PT6H"
+                }]
+            }]
+        }
+
+        result = self.client._map_schedule_response(flight_data, "AA", "1234", "2025-12-25", None)
+
+        self.assertNotIn("raw", result)
+        self.assertEqual(result["segments"], [{"board_point": "JFK", "off_point": "LAX", "duration": "PT6H"}])
+        self.assertEqual(result["legs"][0]["aircraft_type"], "321")
+        self.assertEqual(result["aircraft_type"], "321")
+        self.assertEqual(result["operating_carrier"], {"carrierCode": "AS", "flightNumber": 99})
+
+    @patch("flights_api_client._HTTP.post")
+    @patch("flights_api_client.boto3.client")
+    def test_amadeus_token_cached_until_invalidated(self, mock_boto_client, mock_post):
+        """Test the OAuth token is reused from the TTL cache until invalidated"""
+        mock_boto_client.return_value.get_secret_value.return_value = {
+            'SecretString': json.dumps({'client_id': 'test_client_id', 'client_secret': 'test_client_secret'})
+        }
+        mock_post.return_value.json.return_value = {"access_token": "test_token"}
+
+        self.assertEqual(self.client._get_amadeus_token(), "test_token")
+        self.assertEqual(self.client._get_amadeus_token(), "test_token")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(
+            mock_post.call_args[1]["data"],
+            b"grant_type=client_credentials&client_id=test_client_id&client_secret=test_client_secret"
+        )
+
+        self.client._invalidate_token()
+        self.client._get_amadeus_token()
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch("flights_api_client._HTTP.get")
+    @patch.object(FlightsApiClient, "_get_amadeus_token", side_effect=["stale_token", "fresh_token"])
+    def test_get_flight_schedule_retries_once_on_401(self, mock_token, mock_get):
+        """Test a rejected token is refreshed and the schedule call retried inline"""
+        unauthorized = MagicMock(status_code=401)
+        ok = MagicMock(status_code=200)
+        ok.content = json.dumps({"data": [{"flightPoints": [{"iataCode": "JFK"}, {"iataCode": "LAX"}]}]}).encode()
+        mock_get.side_effect = [unauthorized, ok]
+
+        result = self.client.get_flight_schedule("AA", "1234", "2025-12-25")
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args[1]["headers"]["Authorization"], "Bearer fresh_token")
+        unauthorized.raise_for_status.assert_not_called()
+
+    @patch("flights_api_client._HTTP.get")
+    @patch.object(FlightsApiClient, "_get_amadeus_token", return_value="test_token")
+    def test_get_flight_schedule_cached_until_invalidated(self, mock_token, mock_get):
+        """Test repeat lookups are served from the schedule cache until invalidated"""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.content = json.dumps(
+            {"data": [{"flightPoints": [{"iataCode": "JFK"}, {"iataCode": "LAX"}]}]}
+        ).encode()
+
+        first = self.client.get_flight_schedule("aa", "1234", "2025-12-25")
+        second = self.client.get_flight_schedule("AA", "1234", "2025-12-25")
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+
+        self.client.invalidate_schedule("AA", "1234", "2025-12-25")
+        self.client.get_flight_schedule("AA", "1234", "2025-12-25")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("flights_api_client._HTTP.get")
+    @patch.object(FlightsApiClient, "_get_amadeus_token", return_value="test_token")
+    def test_get_flight_schedule_does_not_cache_misses(self, mock_token, mock_get):
+        """Test lookups that find no flight are not cached"""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.content = b'{"data": []}'
+
+        self.client.get_flight_schedule("AA", "1234", "2025-12-25")
+        result = self.client.get_flight_schedule("AA", "1234", "2025-12-25")
+
+        self.assertEqual(result["status"], "no_flights_found")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(FlightsApiClient, "_get_amadeus_token", return_value="test_token")
+    def test_get_flight_schedule_async_success(self, mock_token):
+        """Test async flight schedule retrieval through the pooled client"""
+        mock_response = MagicMock()
+        mock_response.content = json.dumps({
+            "data": [{
+                "flightDesignator": {"carrierCode": "AA", "flightNumber": "1234"},
+                "flightPoints": [{"iataCode": "JFK"}, {"iataCode": "LAX"}]
+            }]
+        }).encode()
+        mock_async_client = MagicMock()
+        mock_async_client.get = AsyncMock(return_value=mock_response)
+        self.client._async_client = mock_async_client
+
+        result = asyncio.run(self.client.get_flight_schedule_async("aa", "1234", "2025-12-25"))
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["departure_airport"], "JFK")
+        self.assertEqual(result["arrival_airport"], "LAX")
+        _, kwargs = mock_async_client.get.call_args
+        self.assertEqual(kwargs["params"]["carrierCode"], "AA")
+        self.assertEqual(kwargs["headers"]["Authorization"], "Bearer test_token")
+
+    def test_get_flight_schedules_preserves_order(self):
+        """Test concurrent lookups return one result per flight in request order"""
+        async def fake_lookup(carrier_code, flight_number, scheduled_departure_date, operational_suffix=None):
+            return {"status": "success", "flight_number": flight_number}
+
+        with patch.object(self.client, "get_flight_schedule_async", side_effect=fake_lookup):
+            results = self.client.get_flight_schedules([
+                {"carrier_code": "AA", "flight_number": "100", "scheduled_departure_date": "2025-12-25"},
+                {"carrier_code": "DL", "flight_number": "200", "scheduled_departure_date": "2025-12-26"}
+            ])
+
+        self.assertEqual([r["flight_number"] for r in results], ["100", "200"])
+
+    @patch.object(FlightsApiClient, "_get_amadeus_token", return_value="test_token")
+    def test_get_flight_schedules_reuses_pooled_client(self, mock_token):
+        """Test batched lookups keep one pooled client across calls, even inside a running loop"""
+        mock_response = MagicMock()
+        mock_response.content = b'{"data": []}'
+        mock_async_client = MagicMock()
+        mock_async_client.get = AsyncMock(return_value=mock_response)
+        self.client._async_client = mock_async_client
+        flight = {"carrier_code": "AA", "flight_number": "100", "scheduled_departure_date": "2025-12-25"}
+
+        async def from_running_loop():
+            return self.client.get_flight_schedules([flight])
+
+        self.client.get_flight_schedules([flight])
+        results = asyncio.run(from_running_loop())
+
+        self.assertEqual(results[0]["status"], "no_flights_found")
+        self.assertIs(self.client._async_client, mock_async_client)
+        self.assertEqual(mock_async_client.get.await_count, 2)
+
+    @patch.object(FlightsApiClient, "_get_amadeus_token", return_value="test_token")
+    def test_get_flight_schedule_async_runs_on_background_loop(self, mock_token):
+        """Test awaiting from another event loop forwards the request to the pooled client's loop"""
+        seen_loops = []
+
+        async def fake_get(url, headers, params):
+            seen_loops.append(asyncio.get_running_loop())
+            response = MagicMock()
+            response.content = b'{"data": []}'
+            return response
+
+        mock_async_client = MagicMock()
+        mock_async_client.get = fake_get
+        self.client._async_client = mock_async_client
+
+        result = asyncio.run(self.client.get_flight_schedule_async("AA", "100", "2025-12-25"))
+
+        self.assertEqual(result["status"], "no_flights_found")
+        self.assertEqual(seen_loops, [flights_api_client._async_loop()])
+
+    @patch.object(flights_api_client, "SCHEDULES_TIMEOUT_SECONDS", 0.05)
+    def test_get_flight_schedules_times_out(self):
+        """Test a hung batch returns an error per flight instead of blocking the caller"""
+        async def hung_lookup(**flight):
+            await asyncio.sleep(10)
+
+        with patch.object(self.client, "get_flight_schedule_async", side_effect=hung_lookup):
+            results = self.client.get_flight_schedules([
+                {"carrier_code": "AA", "flight_number": "100", "scheduled_departure_date": "2025-12-25"}
+            ])
+
+        self.assertEqual(results[0]["status"], "error")
+        self.assertIn("did not finish", results[0]["details"])
+
 
 class TestFlightScheduleLambdaHandler(unittest.TestCase):
+    def setUp(self):
+        # Each test patches LoungeAccessClient, so drop the client cached by earlier invocations
+        client_patcher = patch("lambda_handler._CLIENT", None)
+        client_patcher.start()
+        self.addCleanup(client_patcher.stop)
     
     @patch("lambda_handler.LoungeAccessClient")
     @patch("lambda_handler.get_flight_schedule")
@@ -174,6 +390,47 @@ class TestFlightScheduleLambdaHandler(unittest.TestCase):
         self.assertEqual(resp["statusCode"], 400)
         body = json.loads(resp["body"])
         self.assertIn("Missing required parameters", body["error"])
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_flight_schedule")
+    def test_get_flight_schedule_invalid_parameters(self, mock_get_flight_schedule, mock_client_cls):
+        """Test flight schedule Lambda handler rejects malformed parameters before any lookup"""
+        ctx = make_context("get_flight_schedule")
+        event = {
+            "carrier_code": "AA",
+            "flight_number": "12345",
+            "scheduled_departure_date": "2025-12-25"
+        }
+
+        resp = lambda_handler(event=event, context=ctx)
+
+        self.assertEqual(resp["statusCode"], 400)
+        body = json.loads(resp["body"])
+        self.assertIn("flight_number", body["error"])
+        mock_get_flight_schedule.assert_not_called()
+        mock_client_cls.assert_not_called()
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_flight_schedule")
+    def test_get_flight_schedule_empty_null_and_wrong_type(self, mock_get_flight_schedule, mock_client_cls):
+        """Test empty, null and wrong-type fields get the fixed error messages, not library text"""
+        ctx = make_context("get_flight_schedule")
+        valid = {"carrier_code": "AA", "flight_number": "1234", "scheduled_departure_date": "2025-12-25"}
+        missing = "Missing required parameters: carrier_code, flight_number, scheduled_departure_date"
+        cases = [
+            ({"carrier_code": ""}, missing),
+            ({"flight_number": None}, missing),
+            ({"flight_number": 1234}, lambda_handler_module._INVALID_FLIGHT_PARAMETERS),
+            ({"operational_suffix": 7}, lambda_handler_module._INVALID_FLIGHT_PARAMETERS),
+        ]
+        for override, expected in cases:
+            with self.subTest(override=override):
+                resp = lambda_handler(event={**valid, **override}, context=ctx)
+
+                self.assertEqual(resp["statusCode"], 400)
+                self.assertEqual(json.loads(resp["body"])["error"], expected)
+        mock_get_flight_schedule.assert_not_called()
+        mock_client_cls.assert_not_called()
     
     @patch("lambda_handler.LoungeAccessClient")
     @patch("lambda_handler.get_flight_schedule")
@@ -215,5 +472,32 @@ class TestFlightScheduleLambdaHandler(unittest.TestCase):
         )
 
 
+
+class TestMcpGetFlightSchedule(unittest.TestCase):
+
+    def test_lounge_availability_for_both_airports(self):
+        """Test departure and arrival lounge lookups are both reported, with failures mapped to None"""
+        api_client = MagicMock()
+        api_client.get_flight_schedule.return_value = {
+            "status": "success",
+            "departure_airport": "JFK",
+            "arrival_airport": "LAX"
+        }
+
+        def lounges_by_airport(airport):
+            if airport == "LAX":
+                raise RuntimeError("lookup failed")
+            return {"lounges": [{"lounge_id": "L1"}]}
+
+        api_client.get_lounges_by_airport.side_effect = lounges_by_airport
+
+        result = mcp_get_flight_schedule("AA", "1234", "2025-12-25", api_client)
+
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(result["departure_lounges_available"])
+        self.assertIsNone(result["arrival_lounges_available"])
+        self.assertEqual(api_client.get_lounges_by_airport.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
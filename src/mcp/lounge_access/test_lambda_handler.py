@@ -1,5 +1,6 @@
 import json
 import unittest
+from decimal import Decimal
 from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 import os
@@ -7,7 +8,8 @@ import sys
 
 # Ensure the tests can import modules from this package directory
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, CURRENT_DIR)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
 from lambda_handler import lambda_handler
 
@@ -21,6 +23,12 @@ def make_context(tool_name=None):
 
 
 class TestLambdaHandler(unittest.TestCase):
+    def setUp(self):
+        # Each test patches LoungeAccessClient, so drop the client cached by earlier invocations
+        client_patcher = patch("lambda_handler._CLIENT", None)
+        client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+
     @patch("lambda_handler.LoungeAccessClient")
     @patch("lambda_handler.tool_example_1")
     def test_tool_example_1_success_with_delimiter(self, mock_tool1, mock_client_cls):
@@ -143,6 +151,40 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertEqual(body["result"], expected_result)
         mock_get_user.assert_called_once_with("LAA_001", mock_client)
 
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_user")
+    def test_get_user_serializes_dynamodb_types(self, mock_get_user, mock_client_cls):
+        # Arrange: DynamoDB hands back string sets and Decimal numbers
+        mock_client_cls.return_value = MagicMock()
+        mock_get_user.return_value = {"memberships": {"priority_pass"}, "visits": Decimal("3"), "rating": Decimal("4.5")}
+        ctx = make_context("get_user")
+
+        # Act
+        resp = lambda_handler(event={"user_id": "LAA_001"}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 200)
+        body = json.loads(resp["body"])
+        self.assertEqual(body["result"], {"memberships": ["priority_pass"], "visits": 3, "rating": 4.5})
+        self.assertIsInstance(body["result"]["visits"], int)
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_user")
+    def test_response_body_is_compact(self, mock_get_user, mock_client_cls):
+        # Arrange
+        mock_client_cls.return_value = MagicMock()
+        mock_get_user.return_value = {"user_id": "LAA_001", "memberships": ["priority_pass", "amex_platinum"]}
+        ctx = make_context("get_user")
+
+        # Act
+        resp = lambda_handler(event={"user_id": "LAA_001"}, context=ctx)
+
+        # Assert: no separator whitespace on the wire
+        self.assertEqual(
+            resp["body"],
+            '{"result":{"user_id":"LAA_001","memberships":["priority_pass","amex_platinum"]}}'
+        )
+
     @patch("lambda_handler.LoungeAccessClient")
     @patch("lambda_handler.get_user")
     def test_get_user_missing_user_id(self, mock_get_user, mock_client_cls):
@@ -161,6 +203,22 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertIn("error", body)
         self.assertEqual(body["error"], "Missing required parameter: user_id")
         mock_get_user.assert_not_called()
+        mock_client_cls.assert_not_called()
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_user")
+    def test_get_user_non_string_user_id(self, mock_get_user, mock_client_cls):
+        # Arrange
+        ctx = make_context("get_user")
+
+        # Act
+        resp = lambda_handler(event={"user_id": ["LAA_001"]}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 400)
+        self.assertEqual(json.loads(resp["body"])["error"], "Invalid user_id: expected a string")
+        mock_get_user.assert_not_called()
+        mock_client_cls.assert_not_called()
 
     @patch("lambda_handler.LoungeAccessClient")
     @patch("lambda_handler.get_user")
@@ -206,6 +264,176 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertEqual(body["error"], "Invalid user ID format")
         mock_get_user.assert_called_once_with("INVALID_ID", mock_client)
 
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_lounges_with_access_rules")
+    def test_search_lounges_success(self, mock_search, mock_client_cls):
+        # Arrange
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+        mock_search.return_value = {"airport": "JFK", "lounges": [], "total_lounges": 0, "status": "no_lounges_found"}
+        ctx = make_context("prefix___search_lounges")
+
+        # Act
+        resp = lambda_handler(event={"airport": "JFK"}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 200)
+        body = json.loads(resp["body"])
+        self.assertEqual(body["result"]["airport"], "JFK")
+        mock_search.assert_called_once_with("JFK", mock_client, None)
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_lounges_with_access_rules")
+    def test_search_lounges_passes_user_id(self, mock_search, mock_client_cls):
+        # Arrange
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+        mock_search.return_value = {"airport": "JFK", "lounges": [], "user": {"user_id": "LAA_001"}}
+        ctx = make_context("search_lounges")
+
+        # Act
+        resp = lambda_handler(event={"airport": "JFK", "user_id": "LAA_001"}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 200)
+        self.assertEqual(json.loads(resp["body"])["result"]["user"]["user_id"], "LAA_001")
+        mock_search.assert_called_once_with("JFK", mock_client, "LAA_001")
+
+    @patch("lambda_handler.LoungeAccessClient")
+    def test_search_lounges_survives_user_lookup_failure(self, mock_client_cls):
+        # Arrange: the profile lookup fails while the lounge query succeeds
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+        mock_client.get_lounges_by_airport.return_value = {"airport": "JFK", "lounges": [{"lounge_id": "L1"}]}
+        mock_client.get_user.side_effect = RuntimeError("boom")
+        ctx = make_context("search_lounges")
+
+        # Act
+        resp = lambda_handler(event={"airport": "JFK", "user_id": "LAA_001"}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 200)
+        result = json.loads(resp["body"])["result"]
+        self.assertEqual(result["total_lounges"], 1)
+        self.assertIsNone(result["user"])
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_lounges_with_access_rules")
+    def test_search_lounges_non_string_user_id(self, mock_search, mock_client_cls):
+        # Arrange
+        ctx = make_context("search_lounges")
+
+        # Act
+        resp = lambda_handler(event={"airport": "JFK", "user_id": {"id": "LAA_001"}}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 400)
+        self.assertEqual(json.loads(resp["body"])["error"], "Invalid user_id: expected a string")
+        mock_search.assert_not_called()
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_lounges_with_access_rules")
+    def test_search_lounges_invalid_airport_code(self, mock_search, mock_client_cls):
+        # Arrange
+        ctx = make_context("search_lounges")
+
+        # Act
+        resp = lambda_handler(event={"airport": "JFK1"}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 400)
+        self.assertIn("Invalid airport code", json.loads(resp["body"])["error"])
+        mock_search.assert_not_called()
+        mock_client_cls.assert_not_called()
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_lounges_with_access_rules")
+    def test_search_lounges_unexpected_error(self, mock_search, mock_client_cls):
+        # Arrange
+        mock_client_cls.return_value = MagicMock()
+        mock_search.side_effect = RuntimeError("DynamoDB unavailable")
+        ctx = make_context("search_lounges")
+
+        # Act
+        with self.assertLogs("lambda_handler", level="ERROR") as logs:
+            resp = lambda_handler(event={"airport": "JFK"}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 500)
+        self.assertEqual(json.loads(resp["body"])["error"], "DynamoDB unavailable")
+        self.assertIn("search_lounges failed", logs.output[0])
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_user")
+    def test_get_user_from_api_gateway_body(self, mock_get_user, mock_client_cls):
+        # Arrange: API Gateway delivers the payload as a JSON string body
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+        mock_get_user.return_value = {"user_id": "LAA_001"}
+        ctx = make_context("get_user")
+
+        # Act
+        resp = lambda_handler(event={"body": '{"user_id": "LAA_001"}'}, context=ctx)
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 200)
+        mock_get_user.assert_called_once_with("LAA_001", mock_client)
+
+    @patch("lambda_handler.get_user")
+    def test_non_object_json_body_rejected(self, mock_get_user):
+        ctx = make_context("get_user")
+        for body in ('[]', '"x"', '5'):
+            with self.subTest(body=body):
+                # Act
+                resp = lambda_handler(event={"body": body}, context=ctx)
+
+                # Assert
+                self.assertEqual(resp["statusCode"], 400)
+                self.assertEqual(json.loads(resp["body"]), {"error": "Invalid JSON body"})
+        mock_get_user.assert_not_called()
+
+    @patch("lambda_handler.get_user")
+    def test_non_dict_body_rejected(self, mock_get_user):
+        ctx = make_context("get_user")
+        for body in (5, ["a"]):
+            with self.subTest(body=body):
+                # Act
+                resp = lambda_handler(event={"body": body}, context=ctx)
+
+                # Assert
+                self.assertEqual(resp["statusCode"], 400)
+                self.assertEqual(json.loads(resp["body"]), {"error": "Invalid request body"})
+        mock_get_user.assert_not_called()
+
+    @patch("lambda_handler.LoungeAccessClient")
+    @patch("lambda_handler.get_user")
+    def test_client_reused_across_invocations(self, mock_get_user, mock_client_cls):
+        # Arrange
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+        mock_get_user.return_value = {"user_id": "LAA_001"}
+        ctx = make_context("get_user")
+
+        # Act
+        lambda_handler(event={"user_id": "LAA_001"}, context=ctx)
+        lambda_handler(event={"user_id": "LAA_001"}, context=ctx)
+
+        # Assert
+        mock_client_cls.assert_called_once_with()
+        self.assertEqual(mock_get_user.call_count, 2)
+
+    @patch("lambda_handler.LoungeAccessClient")
+    def test_unknown_tool_skips_client_construction(self, mock_client_cls):
+        # Act
+        resp = lambda_handler(event={}, context=make_context("prefix___not_a_tool"))
+
+        # Assert
+        self.assertEqual(resp["statusCode"], 400)
+        body = json.loads(resp["body"])
+        self.assertEqual(body["error"], "Unknown tool")
+        self.assertEqual(body["available_tools"], ["search_lounges", "get_user", "get_flight_schedule"])
+        mock_client_cls.assert_not_called()
+
     def test_unknown_tool_when_no_context(self):
         # Arrange: context without client_context yields unknown tool
         ctx = SimpleNamespace(client_context=None)
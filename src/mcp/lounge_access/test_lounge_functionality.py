@@ -11,7 +11,8 @@ import os
 
 # Add the current directory to the path
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, CURRENT_DIR)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
 # Import and test the API client with proper mocking
 def test_lounge_api_client():
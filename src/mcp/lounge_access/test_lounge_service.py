@@ -10,11 +10,19 @@ import os
 
 # Add the current directory to the path to import local modules
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, CURRENT_DIR)
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
 
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from lounge_service import LoungeService
 
 
+def serialized(items):
+    """Encode plain items the way the low-level DynamoDB client returns them."""
+    serializer = TypeSerializer()
+    return [{k: serializer.serialize(v) for k, v in item.items()} for item in items]
+
+
 class TestLoungeServiceInitialization(unittest.TestCase):
     """Test cases for LoungeService initialization."""
 
@@ -94,9 +102,9 @@ class TestLoungeServiceGetLoungesWithAccessRules(unittest.TestCase):
         ]
 
         self.service.lounges_table.query.return_value = {"Items": mock_lounges}
-        self.service.dynamodb.batch_get_item.return_value = {
+        self.service.dynamodb.meta.client.batch_get_item.return_value = {
             "Responses": {
-                "AccessProviders": mock_providers
+                "AccessProviders": serialized(mock_providers)
             }
         }
 
@@ -111,6 +119,15 @@ class TestLoungeServiceGetLoungesWithAccessRules(unittest.TestCase):
         self.assertEqual(lounge["access_details"][0]["provider_name"], "Delta SkyMiles")
         self.assertEqual(lounge["access_details"][1]["provider_name"], "Amex Platinum")
 
+        # Only the attributes the response uses are read back
+        query_kwargs = self.service.lounges_table.query.call_args[1]
+        self.assertIn("access_details", query_kwargs["ExpressionAttributeNames"].values())
+        provider_request = self.service.dynamodb.meta.client.batch_get_item.call_args[1]["RequestItems"]["AccessProviders"]
+        self.assertEqual(
+            sorted(provider_request["ExpressionAttributeNames"].values()),
+            ["conditions", "guest_policy", "notes", "provider_name"]
+        )
+
     def test_get_lounges_with_access_rules_no_lounges(self):
         """Test behavior when no lounges found for airport."""
         # Arrange
@@ -150,6 +167,145 @@ class TestLoungeServiceGetLoungesWithAccessRules(unittest.TestCase):
         self.assertEqual(result["airport"], "JFK")
         self.assertEqual(result["lounges"], [])
 
+    def test_get_lounges_with_access_rules_cached_per_airport(self):
+        """Test repeat lookups for an airport are served from the cache."""
+        # Arrange
+        self.service.lounges_table.query.return_value = {"Items": []}
+
+        # Act
+        first = self.service.get_lounges_with_access_rules("jfk")
+        first["lounges"].append({"lounge_id": "MUTATED"})
+        second = self.service.get_lounges_with_access_rules("JFK")
+
+        # Assert
+        self.assertEqual(second, {"airport": "JFK", "lounges": []})
+        self.service.lounges_table.query.assert_called_once()
+
+    def test_get_lounges_with_access_rules_non_string_airport(self):
+        """Test a non-string airport code returns an empty result instead of raising."""
+        # Act
+        result = self.service.get_lounges_with_access_rules(123)
+
+        # Assert
+        self.assertEqual(result, {"airport": 123, "lounges": []})
+        self.service.lounges_table.query.assert_not_called()
+
+    def test_get_lounges_with_access_rules_errors_not_cached(self):
+        """Test a failed lookup is retried on the next call."""
+        # Arrange
+        self.service.lounges_table.query.side_effect = [Exception("DynamoDB error"), {"Items": []}]
+
+        # Act
+        self.service.get_lounges_with_access_rules("JFK")
+        self.service.get_lounges_with_access_rules("JFK")
+
+        # Assert
+        self.assertEqual(self.service.lounges_table.query.call_count, 2)
+
+    def test_get_lounges_with_access_rules_serves_stale_on_error(self):
+        """Test the last good response is returned when a refresh after expiry fails."""
+        # Arrange
+        self.service.lounges_table.query.side_effect = [
+            {"Items": [{"airport": "JFK", "lounge_id": "L1", "_schema_version": 2}]},
+            Exception("DynamoDB error"),
+        ]
+        first = self.service.get_lounges_with_access_rules("JFK")
+        self.service._lounges_cache.clear()
+
+        # Act
+        second = self.service.get_lounges_with_access_rules("JFK")
+
+        # Assert
+        self.assertEqual(second, first)
+        self.assertEqual(self.service.lounges_table.query.call_count, 2)
+
+    def test_get_lounges_with_access_rules_reuses_cached_providers(self):
+        """Test providers fetched for one airport are not requested again for another."""
+        # Arrange
+        self.service.lounges_table.query.side_effect = [
+            {"Items": [{"airport": "JFK", "lounge_id": "L1", "access_providers": ["Priority Pass"]}]},
+            {"Items": [{"airport": "LAX", "lounge_id": "L2", "access_providers": ["Priority Pass", "Amex Platinum"]}]},
+        ]
+        self.service.dynamodb.meta.client.batch_get_item.side_effect = [
+            {"Responses": {"AccessProviders": serialized([{"provider_name": "Priority Pass", "guest_policy": "1 guest"}])}},
+            {"Responses": {"AccessProviders": serialized([{"provider_name": "Amex Platinum", "guest_policy": "2 guests"}])}},
+        ]
+
+        # Act
+        self.service.get_lounges_with_access_rules("JFK")
+        result = self.service.get_lounges_with_access_rules("LAX")
+
+        # Assert
+        second_keys = self.service.dynamodb.meta.client.batch_get_item.call_args[1]["RequestItems"]["AccessProviders"]["Keys"]
+        self.assertEqual(second_keys, [{"provider_name": {"S": "Amex Platinum"}}])
+        details = result["lounges"][0]["access_details"]
+        self.assertEqual([d["guest_policy"] for d in details], ["1 guest", "2 guests"])
+
+    @patch('lounge_service.time.sleep')
+    def test_get_lounges_with_access_rules_retries_unprocessed_providers(self, mock_sleep):
+        """Test throttled provider keys are re-requested instead of silently dropped."""
+        # Arrange
+        self.service.lounges_table.query.return_value = {"Items": [
+            {"airport": "JFK", "lounge_id": "L1", "access_providers": ["Priority Pass", "Amex Platinum"]}
+        ]}
+        unprocessed = {"Keys": [{"provider_name": {"S": "Amex Platinum"}}]}
+        self.service.dynamodb.meta.client.batch_get_item.side_effect = [
+            {"Responses": {"AccessProviders": serialized([{"provider_name": "Priority Pass", "guest_policy": "1 guest"}])},
+             "UnprocessedKeys": {"AccessProviders": unprocessed}},
+            {"Responses": {"AccessProviders": serialized([{"provider_name": "Amex Platinum", "guest_policy": "2 guests"}])},
+             "UnprocessedKeys": {}},
+        ]
+
+        # Act
+        result = self.service.get_lounges_with_access_rules("JFK")
+
+        # Assert
+        retry_request = self.service.dynamodb.meta.client.batch_get_item.call_args[1]["RequestItems"]["AccessProviders"]
+        self.assertEqual(retry_request, unprocessed)
+        mock_sleep.assert_called_once()
+        details = {d["provider_name"]: d["guest_policy"] for d in result["lounges"][0]["access_details"]}
+        self.assertEqual(details, {"Priority Pass": "1 guest", "Amex Platinum": "2 guests"})
+
+    @patch('lounge_service.time.sleep')
+    def test_get_lounges_with_access_rules_partial_providers_not_cached(self, mock_sleep):
+        """Test providers still unprocessed after the last attempt leave the response uncached."""
+        # Arrange
+        self.service.lounges_table.query.return_value = {"Items": [
+            {"airport": "JFK", "lounge_id": "L1", "access_providers": ["Amex Platinum"]}
+        ]}
+        unprocessed = {"Keys": [{"provider_name": {"S": "Amex Platinum"}}]}
+        self.service.dynamodb.meta.client.batch_get_item.return_value = {
+            "Responses": {}, "UnprocessedKeys": {"AccessProviders": unprocessed}
+        }
+
+        # Act
+        with self.assertLogs("lounge_service", level="ERROR") as logs:
+            self.service.get_lounges_with_access_rules("JFK")
+        self.service.get_lounges_with_access_rules("JFK")
+
+        # Assert
+        self.assertEqual(mock_sleep.call_count, 2 * 4)
+        self.assertIn("Amex Platinum", logs.output[0])
+        self.assertEqual(self.service.lounges_table.query.call_count, 2)
+
+    def test_get_lounges_with_access_rules_precomputed_rows_skip_provider_fetch(self):
+        """Test rows with baked-in access_details are returned without a provider lookup."""
+        # Arrange
+        details = [{"provider_name": "Priority Pass", "guest_policy": "Guests $32 each",
+                    "conditions": None, "notes": None}]
+        self.service.lounges_table.query.return_value = {"Items": [{
+            "airport": "JFK", "lounge_id": "L1", "access_providers": ["Priority Pass"],
+            "access_details": details, "_schema_version": 2
+        }]}
+
+        # Act
+        result = self.service.get_lounges_with_access_rules("JFK")
+
+        # Assert
+        self.assertEqual(result["lounges"][0]["access_details"], details)
+        self.assertNotIn("_schema_version", result["lounges"][0])
+        self.service.dynamodb.meta.client.batch_get_item.assert_not_called()
+
     def test_get_lounges_with_access_rules_missing_providers(self):
         """Test behavior when some providers are missing from providers table."""
         # Arrange
@@ -178,9 +334,9 @@ class TestLoungeServiceGetLoungesWithAccessRules(unittest.TestCase):
         ]
 
         self.service.lounges_table.query.return_value = {"Items": mock_lounges}
-        self.service.dynamodb.batch_get_item.return_value = {
+        self.service.dynamodb.meta.client.batch_get_item.return_value = {
             "Responses": {
-                "AccessProviders": mock_providers
+                "AccessProviders": serialized(mock_providers)
             }
         }
 
@@ -260,6 +416,40 @@ class TestLoungeServiceGetLoungesByAirport(unittest.TestCase):
         from boto3.dynamodb.conditions import Key
         self.service.lounges_table.query.assert_called_once()
 
+    def test_get_lounges_by_airport_cached_per_airport(self):
+        """Test repeat filter reads for an airport reuse the cached rows."""
+        # Arrange
+        self.service.lounges_table.query.return_value = {"Items": [{"airport": "JFK", "lounge_id": "JFK_LOUNGE_1"}]}
+
+        # Act
+        first = self.service.get_lounges_by_airport("jfk")
+        first.clear()
+        second = self.service.get_lounges_by_airport("JFK")
+
+        # Assert
+        self.assertEqual(second, [{"airport": "JFK", "lounge_id": "JFK_LOUNGE_1"}])
+        self.service.lounges_table.query.assert_called_once()
+
+    def test_get_lounges_by_airport_strips_schema_version(self):
+        """Test the precomputed-row storage marker is not returned with whole rows."""
+        # Arrange
+        self.service.lounges_table.query.return_value = {"Items": [
+            {"airport": "JFK", "lounge_id": "JFK_LOUNGE_1", "_schema_version": 2}
+        ]}
+
+        # Act
+        result = self.service.get_lounges_by_airport("JFK")
+
+        # Assert
+        self.assertEqual(result, [{"airport": "JFK", "lounge_id": "JFK_LOUNGE_1"}])
+
+    def test_get_lounges_by_airport_non_string_airport(self):
+        """Test a non-string airport code returns an empty list instead of raising."""
+        for airport_code in (None, 123):
+            with self.subTest(airport_code=airport_code):
+                self.assertEqual(self.service.get_lounges_by_airport(airport_code), [])
+        self.service.lounges_table.query.assert_not_called()
+
 
 class TestLoungeServiceGetLoungeById(unittest.TestCase):
     """Test cases for get_lounge_by_id method."""
@@ -336,40 +526,36 @@ class TestLoungeServiceCreateSampleLounges(unittest.TestCase):
                 self.service = LoungeService()
                 self.service.lounges_table = Mock()
                 self.service.providers_table = Mock()
+                self.batch_write_item = self.service.dynamodb.meta.client.batch_write_item
+                self.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+    def _written_items(self, table_name):
+        """Deserialize every item written to table_name via BatchWriteItem."""
+        deserializer = TypeDeserializer()
+        items = []
+        for call in self.batch_write_item.call_args_list:
+            for request in call[1]["RequestItems"].get(table_name, []):
+                items.append({k: deserializer.deserialize(v) for k, v in request["PutRequest"]["Item"].items()})
+        return items
 
     def test_create_sample_lounges_success(self):
         """Test successful creation of sample lounges."""
-        # Arrange
-        mock_lounges_batch_writer = Mock()
-        mock_providers_batch_writer = Mock()
-        
-        # Mock context managers properly
-        mock_lounges_context = Mock()
-        mock_providers_context = Mock()
-        mock_lounges_context.__enter__ = Mock(return_value=mock_lounges_batch_writer)
-        mock_lounges_context.__exit__ = Mock(return_value=None)
-        mock_providers_context.__enter__ = Mock(return_value=mock_providers_batch_writer)
-        mock_providers_context.__exit__ = Mock(return_value=None)
-        
-        self.service.lounges_table.batch_writer.return_value = mock_lounges_context
-        self.service.providers_table.batch_writer.return_value = mock_providers_context
-
         # Act
         result = self.service.create_sample_lounges()
 
         # Assert
         self.assertTrue(result)
-        # Verify batch writers were used
-        self.service.lounges_table.batch_writer.assert_called_once()
-        self.service.providers_table.batch_writer.assert_called_once()
-        # Verify put_item was called for each sample item
-        self.assertTrue(mock_lounges_batch_writer.put_item.called)
-        self.assertTrue(mock_providers_batch_writer.put_item.called)
+        # Verify both tables were written
+        self.assertTrue(self._written_items("Lounges"))
+        self.assertTrue(self._written_items("AccessProviders"))
+        for call in self.batch_write_item.call_args_list:
+            for requests in call[1]["RequestItems"].values():
+                self.assertLessEqual(len(requests), 25)
 
     def test_create_sample_lounges_exception(self):
         """Test exception handling during sample creation."""
         # Arrange
-        self.service.lounges_table.batch_writer.side_effect = Exception("DynamoDB error")
+        self.batch_write_item.side_effect = Exception("DynamoDB error")
 
         # Act
         result = self.service.create_sample_lounges()
@@ -377,51 +563,94 @@ class TestLoungeServiceCreateSampleLounges(unittest.TestCase):
         # Assert
         self.assertFalse(result)
 
-    def test_create_sample_lounges_data_content(self):
-        """Test that sample data contains expected content."""
+    @patch('lounge_service.time.sleep')
+    def test_create_sample_lounges_retries_unprocessed_items(self, mock_sleep):
+        """Test unprocessed puts are resubmitted after a backoff until DynamoDB accepts them."""
         # Arrange
-        mock_lounges_batch_writer = Mock()
-        mock_providers_batch_writer = Mock()
-        
-        # Mock context managers properly
-        mock_lounges_context = Mock()
-        mock_providers_context = Mock()
-        mock_lounges_context.__enter__ = Mock(return_value=mock_lounges_batch_writer)
-        mock_lounges_context.__exit__ = Mock(return_value=None)
-        mock_providers_context.__enter__ = Mock(return_value=mock_providers_batch_writer)
-        mock_providers_context.__exit__ = Mock(return_value=None)
-        
-        self.service.lounges_table.batch_writer.return_value = mock_lounges_context
-        self.service.providers_table.batch_writer.return_value = mock_providers_context
+        unprocessed = {"Lounges": [{"PutRequest": {"Item": {"airport": {"S": "JFK"}}}}]}
+        self.batch_write_item.side_effect = [
+            {"UnprocessedItems": unprocessed}, {"UnprocessedItems": {}}, {"UnprocessedItems": {}}
+        ]
+
+        # Act
+        result = self.service.create_sample_lounges()
+
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(self.batch_write_item.call_args_list[1][1]["RequestItems"], unprocessed)
+        mock_sleep.assert_called_once()
+
+    @patch('lounge_service.time.sleep')
+    def test_create_sample_lounges_gives_up_on_unprocessed_items(self, mock_sleep):
+        """Test sustained throttling stops after the attempt cap and reports failure."""
+        # Arrange: every put comes back unprocessed
+        self.batch_write_item.side_effect = lambda RequestItems: {"UnprocessedItems": RequestItems}
 
         # Act
         result = self.service.create_sample_lounges()
 
+        # Assert
+        self.assertFalse(result)
+        lounge_calls = [c for c in self.batch_write_item.call_args_list if "Lounges" in c[1]["RequestItems"]]
+        self.assertEqual(len(lounge_calls), 5)
+
+    def test_create_sample_lounges_data_content(self):
+        """Test that sample data contains expected content."""
+        # Act
+        result = self.service.create_sample_lounges()
+
         # Assert
         self.assertTrue(result)
         
         # Check that lounges were created
-        lounges_calls = mock_lounges_batch_writer.put_item.call_args_list
-        self.assertGreater(len(lounges_calls), 0)
+        lounge_items = self._written_items("Lounges")
+        self.assertGreater(len(lounge_items), 0)
         
         # Check that at least one lounge has expected structure
-        first_lounge_call = lounges_calls[0]
-        lounge_item = first_lounge_call[1]['Item']  # Extract the Item parameter
+        lounge_item = lounge_items[0]
         required_fields = ['airport', 'lounge_id', 'name', 'terminal', 'access_providers', 'amenities']
         for field in required_fields:
             self.assertIn(field, lounge_item)
 
         # Check that providers were created
-        providers_calls = mock_providers_batch_writer.put_item.call_args_list
-        self.assertGreater(len(providers_calls), 0)
+        provider_items = self._written_items("AccessProviders")
+        self.assertGreater(len(provider_items), 0)
         
         # Check that at least one provider has expected structure
-        first_provider_call = providers_calls[0]
-        provider_item = first_provider_call[1]['Item']
+        provider_item = provider_items[0]
         required_provider_fields = ['provider_name', 'guest_policy', 'conditions', 'notes']
         for field in required_provider_fields:
             self.assertIn(field, provider_item)
 
+        # Lounges are stored with their access details precomputed
+        self.assertEqual(lounge_item['_schema_version'], 2)
+        self.assertEqual(
+            [d['provider_name'] for d in lounge_item['access_details']],
+            lounge_item['access_providers']
+        )
+        self.assertTrue(all(d['guest_policy'] for d in lounge_item['access_details']))
+
+    def test_refresh_access_details_rewrites_lounges(self):
+        """Test refresh_access_details bakes current provider rules into every lounge row."""
+        # Arrange
+        self.service.providers_table.scan.return_value = {
+            "Items": [{"provider_name": "Priority Pass", "guest_policy": "Guests $35 each"}]
+        }
+        self.service.lounges_table.scan.side_effect = [
+            {"Items": [{"airport": "JFK", "lounge_id": "L1", "access_providers": ["Priority Pass"]}],
+             "LastEvaluatedKey": {"airport": "JFK", "lounge_id": "L1"}},
+            {"Items": [{"airport": "LAX", "lounge_id": "L2", "access_providers": ["Priority Pass"]}]},
+        ]
+
+        # Act
+        result = self.service.refresh_access_details()
+
+        # Assert
+        self.assertTrue(result)
+        items = self._written_items("Lounges")
+        self.assertEqual([i['lounge_id'] for i in items], ["L1", "L2"])
+        self.assertEqual(items[1]['access_details'][0]['guest_policy'], "Guests $35 each")
+
 
 class TestLoungeServiceTableManagement(unittest.TestCase):
     """Test cases for table management methods."""
@@ -430,6 +659,16 @@ class TestLoungeServiceTableManagement(unittest.TestCase):
         """Set up test fixtures before each test method."""
         self.mock_dynamodb = Mock()
         self.mock_table = Mock()
+        # Table checks only run when explicitly enabled
+        env_patcher = patch.dict(os.environ, {"LOUNGE_ENSURE_TABLES": "1"})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        # Verification is remembered per container; start each test unverified
+        verified_patcher = patch.object(LoungeService, '_tables_verified', False)
+        verified_patcher.start()
+        self.addCleanup(verified_patcher.stop)
+        self.paginate = self.mock_dynamodb.meta.client.get_paginator.return_value.paginate
+        self.paginate.return_value = [{"TableNames": []}]
 
     @patch('lounge_service.boto3.resource')
     def test_ensure_table_exists_table_found(self, mock_boto3_resource):
@@ -487,6 +726,57 @@ class TestLoungeServiceTableManagement(unittest.TestCase):
         # Should not call create_table for other errors
         self.mock_dynamodb.create_table.assert_not_called()
 
+    @patch('lounge_service.boto3.resource')
+    def test_failed_table_check_is_retried_by_next_instance(self, mock_boto3_resource):
+        """Test a failed table check is not remembered, so the next instance checks again."""
+        # Arrange
+        from botocore.exceptions import ClientError
+        mock_boto3_resource.return_value = self.mock_dynamodb
+        self.mock_dynamodb.Table.return_value = self.mock_table
+        error_response = {'Error': {'Code': 'ResourceNotFoundException'}}
+        self.mock_table.load.side_effect = ClientError(error_response, 'DescribeTable')
+        self.mock_dynamodb.create_table.side_effect = ClientError({'Error': {'Code': 'LimitExceededException'}}, 'CreateTable')
+
+        # Act
+        LoungeService()
+        LoungeService()
+
+        # Assert
+        self.assertFalse(LoungeService._tables_verified)
+        self.assertEqual(self.paginate.call_count, 2)
+
+    @patch('lounge_service.boto3.resource')
+    def test_existing_tables_verified_once_without_describe(self, mock_boto3_resource):
+        """Test listed tables skip DescribeTable and later instances skip the check entirely."""
+        # Arrange
+        mock_boto3_resource.return_value = self.mock_dynamodb
+        self.mock_dynamodb.Table.return_value = self.mock_table
+        self.paginate.return_value = [{"TableNames": ["Lounges"]}, {"TableNames": ["AccessProviders"]}]
+
+        # Act
+        LoungeService()
+        LoungeService()
+
+        # Assert
+        self.paginate.assert_called_once()
+        self.mock_table.load.assert_not_called()
+        self.mock_dynamodb.create_table.assert_not_called()
+
+    @patch('lounge_service.boto3.resource')
+    def test_ensure_table_exists_skipped_by_default(self, mock_boto3_resource):
+        """Test table checks are skipped unless LOUNGE_ENSURE_TABLES is set."""
+        # Arrange
+        mock_boto3_resource.return_value = self.mock_dynamodb
+        self.mock_dynamodb.Table.return_value = self.mock_table
+
+        # Act
+        with patch.dict(os.environ, {"LOUNGE_ENSURE_TABLES": ""}):
+            LoungeService()
+
+        # Assert
+        self.mock_table.load.assert_not_called()
+        self.mock_dynamodb.create_table.assert_not_called()
+
 
 class TestLoungeServiceIntegration(unittest.TestCase):
     """Integration tests for LoungeService with multiple method interactions."""
@@ -503,19 +793,7 @@ class TestLoungeServiceIntegration(unittest.TestCase):
     def test_full_workflow_integration(self):
         """Test a full workflow of creating samples and retrieving data."""
         # Arrange - Mock successful sample creation
-        mock_lounges_batch_writer = Mock()
-        mock_providers_batch_writer = Mock()
-        
-        # Mock context managers properly
-        mock_lounges_context = Mock()
-        mock_providers_context = Mock()
-        mock_lounges_context.__enter__ = Mock(return_value=mock_lounges_batch_writer)
-        mock_lounges_context.__exit__ = Mock(return_value=None)
-        mock_providers_context.__enter__ = Mock(return_value=mock_providers_batch_writer)
-        mock_providers_context.__exit__ = Mock(return_value=None)
-        
-        self.service.lounges_table.batch_writer.return_value = mock_lounges_context
-        self.service.providers_table.batch_writer.return_value = mock_providers_context
+        self.service.dynamodb.meta.client.batch_write_item.return_value = {"UnprocessedItems": {}}
 
         # Mock data retrieval
         mock_lounges = [
@@ -536,8 +814,8 @@ class TestLoungeServiceIntegration(unittest.TestCase):
 
         self.service.lounges_table.query.return_value = {"Items": mock_lounges}
         self.service.lounges_table.get_item.return_value = {"Item": mock_lounges[0]}
-        self.service.dynamodb.batch_get_item.return_value = {
-            "Responses": {"AccessProviders": mock_providers}
+        self.service.dynamodb.meta.client.batch_get_item.return_value = {
+            "Responses": {"AccessProviders": serialized(mock_providers)}
         }
 
         # Act - Test full workflow
@@ -0,0 +1,128 @@
+"""
+Unit tests for the UserProfileService class.
+Tests profile lookups and the per-service user cache.
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add the current directory to the path to import local modules
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from user_profile_service import UserProfileService
+
+
+class TestUserProfileServiceGetUser(unittest.TestCase):
+    """Test cases for get_user caching."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        with patch('user_profile_service.boto3.resource'):
+            self.service = UserProfileService()
+            self.service.user_profile_table = Mock()
+
+    def test_get_user_cached_until_updated(self):
+        """Test repeat lookups hit the cache and an update forces a re-read."""
+        # Arrange
+        self.service.user_profile_table.get_item.return_value = {"Item": {"user_id": "LAA_001"}}
+
+        # Act
+        first = self.service.get_user("LAA_001")
+        second = self.service.get_user("LAA_001")
+        self.service.update_user("LAA_001", {"home_airport": "JFK"})
+        self.service.get_user("LAA_001")
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(self.service.user_profile_table.get_item.call_count, 2)
+
+    def test_get_user_cached_profile_not_shared(self):
+        """Test mutating a returned profile does not change what later lookups see."""
+        # Arrange
+        self.service.user_profile_table.get_item.return_value = {"Item": {"user_id": "LAA_001", "memberships": ["priority_pass"]}}
+
+        # Act
+        first = self.service.get_user("LAA_001")
+        first["memberships"].append("MUTATED")
+        second = self.service.get_user("LAA_001")
+        batch = self.service.get_users(["LAA_001"])
+        batch["LAA_001"]["memberships"].clear()
+
+        # Assert
+        self.assertEqual(second["memberships"], ["priority_pass"])
+        self.assertEqual(self.service.get_user("LAA_001")["memberships"], ["priority_pass"])
+        self.service.user_profile_table.get_item.assert_called_once()
+
+    def test_get_user_not_found_not_cached(self):
+        """Test a missing user is looked up again on the next call."""
+        # Arrange
+        self.service.user_profile_table.get_item.return_value = {}
+
+        # Act
+        self.assertIsNone(self.service.get_user("LAA_404"))
+        self.assertIsNone(self.service.get_user("LAA_404"))
+
+        # Assert
+        self.assertEqual(self.service.user_profile_table.get_item.call_count, 2)
+
+    def test_unhashable_user_id_returns_none(self):
+        """Test a non-hashable user_id is reported as not found instead of raising."""
+        # Act
+        user = self.service.get_user(["LAA_001"])
+        users = self.service.get_users([["LAA_001"]])
+
+        # Assert
+        self.assertIsNone(user)
+        self.assertEqual(users, {})
+
+
+    def test_get_users_batches_uncached_ids(self):
+        """Test get_users serves cached users and batch-gets only the rest."""
+        # Arrange
+        self.service.user_profile_table.get_item.return_value = {"Item": {"user_id": "LAA_001"}}
+        self.service.get_user("LAA_001")
+        client = self.service.dynamodb.meta.client
+        client.batch_get_item.return_value = {
+            "Responses": {"UserProfile": [{"user_id": {"S": "LAA_002"}, "home_airport": {"S": "JFK"}}]},
+            "UnprocessedKeys": {}
+        }
+
+        # Act
+        users = self.service.get_users(["LAA_001", "LAA_002", "LAA_003", "LAA_002"])
+
+        # Assert
+        self.assertEqual(set(users), {"LAA_001", "LAA_002"})
+        self.assertEqual(users["LAA_002"]["home_airport"], "JFK")
+        request = client.batch_get_item.call_args.kwargs["RequestItems"]["UserProfile"]
+        self.assertEqual(request["Keys"], [{"user_id": {"S": "LAA_002"}}, {"user_id": {"S": "LAA_003"}}])
+
+    @patch('user_profile_service.time.sleep')
+    def test_get_users_exhausted_retries_logged_and_not_cached(self, mock_sleep):
+        """Test keys still unprocessed after the last attempt are logged and the batch is not cached."""
+        # Arrange
+        client = self.service.dynamodb.meta.client
+        client.batch_get_item.side_effect = [
+            {"Responses": {"UserProfile": [{"user_id": {"S": "LAA_001"}}]},
+             "UnprocessedKeys": {"UserProfile": {"Keys": [{"user_id": {"S": "LAA_002"}}]}}}
+        ] + [
+            {"Responses": {}, "UnprocessedKeys": {"UserProfile": {"Keys": [{"user_id": {"S": "LAA_002"}}]}}}
+        ] * 4
+
+        # Act
+        with self.assertLogs("user_profile_service", level="ERROR") as logs:
+            users = self.service.get_users(["LAA_001", "LAA_002"])
+
+        # Assert
+        self.assertEqual(set(users), {"LAA_001"})
+        self.assertEqual(client.batch_get_item.call_count, 5)
+        self.assertEqual(mock_sleep.call_count, 4)
+        self.assertIn("LAA_002", logs.output[0])
+        self.assertNotIn("LAA_001", self.service._user_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
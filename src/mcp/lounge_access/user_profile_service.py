@@ -3,9 +3,29 @@ User Profile Service for DynamoDB operations.
 Handles all user profile related database operations.
 """
 
-import json
+import copy
+import logging
+import os
+import threading
+import time
+
 import boto3
 from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeDeserializer
+from cachetools import TTLCache
+
+# Profiles change rarely; repeat lookups within a conversation are served from memory
+USER_CACHE_TTL_SECONDS = 300
+USER_CACHE_MAXSIZE = 1024
+
+# BatchGetItem accepts at most 100 keys per call; throttled keys come back as UnprocessedKeys
+BATCH_GET_LIMIT = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+BATCH_GET_BACKOFF_SECONDS = 0.05
+
+_DESERIALIZER = TypeDeserializer()
+
+logger = logging.getLogger("user_profile_service")
 
 
 class UserProfileService:
@@ -23,8 +43,13 @@ class UserProfileService:
         self.dynamodb = boto3.resource('dynamodb')
         self.table_name = table_name
         self.user_profile_table = self.dynamodb.Table(table_name)
-        # Ensure table exists
-        self._ensure_table_exists()
+        # user_id -> profile item; only users that were found are cached, and callers get copies
+        self._user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL_SECONDS)
+        # cachetools caches are not thread-safe, and get_user runs on the lounge lookup pool
+        self._user_cache_lock = threading.Lock()
+        # Ensure table exists (opt-in via LOUNGE_ENSURE_TABLES=1 to keep Lambda init free of DescribeTable)
+        if os.getenv("LOUNGE_ENSURE_TABLES") == "1":
+            self._ensure_table_exists()
 
     def get_user(self, user_id: str):
         """
@@ -38,6 +63,11 @@ class UserProfileService:
                  Returns None if user not found or error occurs
         """
         try:
+            with self._user_cache_lock:
+                cached = self._user_cache.get(user_id)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
             # Query DynamoDB UserProfile table
             response = self.user_profile_table.get_item(
                 Key={
@@ -48,9 +78,11 @@ class UserProfileService:
             # Check if item was found
             if 'Item' in response:
                 user_item = response['Item']
+                with self._user_cache_lock:
+                    self._user_cache[user_id] = user_item
                 
                 # Return user data in the expected format
-                return user_item
+                return copy.deepcopy(user_item)
                
             else:
                 # User not found in DynamoDB
@@ -58,14 +90,68 @@ class UserProfileService:
                 
         except ClientError as e:
             # Log the error and return None
-            print(f"Error retrieving user {user_id} from DynamoDB: {e.response['Error']['Message']}")
+            logger.error("Error retrieving user %s from DynamoDB: %s", user_id, e.response['Error']['Message'])
             return None
         except Exception as e:
             # Handle any other unexpected errors
-            print(f"Unexpected error retrieving user {user_id}: {str(e)}")
+            logger.error("Unexpected error retrieving user %s: %s", user_id, e)
             return None
 
-   
+    def get_users(self, user_ids):
+        """
+        Retrieves several users at once, reading uncached ids with BatchGetItem.
+        
+        Args:
+            user_ids (list): The unique identifiers of the users
+            
+        Returns:
+            dict: user_id -> user information for every user that was found
+        """
+        users = {}
+        try:
+            missing = []
+            for user_id in dict.fromkeys(user_ids):
+                with self._user_cache_lock:
+                    cached = self._user_cache.get(user_id)
+                if cached is not None:
+                    users[user_id] = cached
+                else:
+                    missing.append(user_id)
+
+            client = self.dynamodb.meta.client
+            keys = [{'user_id': {'S': user_id}} for user_id in missing]
+            for start in range(0, len(keys), BATCH_GET_LIMIT):
+                request = {'Keys': keys[start:start + BATCH_GET_LIMIT]}
+                fetched = {}
+                for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                    response = client.batch_get_item(RequestItems={self.table_name: request})
+                    for item in response.get('Responses', {}).get(self.table_name, []):
+                        user_item = {k: _DESERIALIZER.deserialize(v) for k, v in item.items()}
+                        fetched[user_item['user_id']] = user_item
+                    request = response.get('UnprocessedKeys', {}).get(self.table_name)
+                    if not request or attempt == BATCH_GET_MAX_ATTEMPTS - 1:
+                        break
+                    time.sleep(BATCH_GET_BACKOFF_SECONDS * 2 ** attempt)
+                users.update(fetched)
+                if request:
+                    # Mirror LoungeService._fetch_providers: report the gap and leave the batch uncached
+                    logger.error(
+                        "Gave up fetching users after %d attempts: %s",
+                        BATCH_GET_MAX_ATTEMPTS,
+                        [k['user_id']['S'] for k in request['Keys']]
+                    )
+                    continue
+                with self._user_cache_lock:
+                    self._user_cache.update(fetched)
+
+        except ClientError as e:
+            logger.error("Error retrieving users from DynamoDB: %s", e.response['Error']['Message'])
+        except Exception as e:
+            logger.error("Unexpected error retrieving users: %s", e)
+
+        # Fetched items are also in the cache, so hand out copies of every profile
+        return copy.deepcopy(users)
+
 
     def create_user(self, user_data):
         """
@@ -79,14 +165,16 @@ class UserProfileService:
         """
         try:
             self.user_profile_table.put_item(Item=user_data)
-            print(f"Successfully created user {user_data.get('user_id')}")
+            with self._user_cache_lock:
+                self._user_cache.pop(user_data.get('user_id'), None)
+            logger.info("Successfully created user %s", user_data.get('user_id'))
             return True
             
         except ClientError as e:
-            print(f"Error creating user: {e.response['Error']['Message']}")
+            logger.error("Error creating user: %s", e.response['Error']['Message'])
             return False
         except Exception as e:
-            print(f"Unexpected error creating user: {str(e)}")
+            logger.error("Unexpected error creating user: %s", e)
             return False
 
     def update_user(self, user_id, update_data):
@@ -119,17 +207,19 @@ class UserProfileService:
                     UpdateExpression=update_expression,
                     ExpressionAttributeValues=expression_attribute_values
                 )
-                print(f"Successfully updated user {user_id}")
+                with self._user_cache_lock:
+                    self._user_cache.pop(user_id, None)
+                logger.info("Successfully updated user %s", user_id)
                 return True
             else:
-                print("No valid update data provided")
+                logger.warning("No valid update data provided")
                 return False
                 
         except ClientError as e:
-            print(f"Error updating user {user_id}: {e.response['Error']['Message']}")
+            logger.error("Error updating user %s: %s", user_id, e.response['Error']['Message'])
             return False
         except Exception as e:
-            print(f"Unexpected error updating user {user_id}: {str(e)}")
+            logger.error("Unexpected error updating user %s: %s", user_id, e)
             return False
 
     def delete_user(self, user_id):
@@ -146,14 +236,16 @@ class UserProfileService:
             self.user_profile_table.delete_item(
                 Key={'user_id': user_id}
             )
-            print(f"Successfully deleted user {user_id}")
+            with self._user_cache_lock:
+                self._user_cache.pop(user_id, None)
+            logger.info("Successfully deleted user %s", user_id)
             return True
             
         except ClientError as e:
-            print(f"Error deleting user {user_id}: {e.response['Error']['Message']}")
+            logger.error("Error deleting user %s: %s", user_id, e.response['Error']['Message'])
             return False
         except Exception as e:
-            print(f"Unexpected error deleting user {user_id}: {str(e)}")
+            logger.error("Unexpected error deleting user %s: %s", user_id, e)
             return False
 
     def _ensure_table_exists(self):
@@ -163,16 +255,16 @@ class UserProfileService:
         try:
             # Try to load the table to check if it exists
             self.user_profile_table.load()
-            print(f"{self.table_name} table already exists")
+            logger.info("%s table already exists", self.table_name)
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceNotFoundException':
                 # Table doesn't exist, create it
-                print(f"{self.table_name} table not found, creating it...")
+                logger.info("%s table not found, creating it...", self.table_name)
                 self._create_user_profile_table()
             else:
-                print(f"Error checking table existence: {e.response['Error']['Message']}")
+                logger.error("Error checking table existence: %s", e.response['Error']['Message'])
         except Exception as e:
-            print(f"Unexpected error checking table: {str(e)}")
+            logger.error("Unexpected error checking table: %s", e)
 
     def _create_user_profile_table(self):
         """
@@ -201,9 +293,9 @@ class UserProfileService:
             )
             
             # Wait for table to be created
-            print(f"Creating {self.table_name} table...")
+            logger.info("Creating %s table...", self.table_name)
             table.wait_until_exists()
-            print(f"{self.table_name} table created successfully")
+            logger.info("%s table created successfully", self.table_name)
             
             # Update the table reference
             self.user_profile_table = table
@@ -211,8 +303,8 @@ class UserProfileService:
             return True
             
         except ClientError as e:
-            print(f"Error creating {self.table_name} table: {e.response['Error']['Message']}")
+            logger.error("Error creating %s table: %s", self.table_name, e.response['Error']['Message'])
             return False
         except Exception as e:
-            print(f"Unexpected error creating table: {str(e)}")
+            logger.error("Unexpected error creating table: %s", e)
             return False
\ No newline at end of file